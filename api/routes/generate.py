@@ -49,11 +49,12 @@ def _schema_to_analysis(data) -> GameAnalysis:
 @router.post("/generate-assets", response_model=GeneratedAssetSetSchema)
 def generate_assets(req: GenerateAssetsRequest):
     analysis = _schema_to_analysis(req.analysis)
-    generator = GameAssetGenerator()
-    asset_set = generator.generate_for_game(
-        analysis=analysis,
-        style_id=req.style_id,
-    )
+    # Closed per request: the generator owns a download pool and event loop
+    with GameAssetGenerator() as generator:
+        asset_set = generator.generate_for_game(
+            analysis=analysis,
+            style_id=req.style_id,
+        )
     return GeneratedAssetSetSchema(
         game_name=asset_set.game_name,
         mechanic_type=MechanicTypeEnum(asset_set.mechanic_type.value),
@@ -8,16 +8,52 @@ This module extracts:
 - Recommended template and configuration
 """
 
+import asyncio
 import base64
+import binascii
+import functools
+import hashlib
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from io import BytesIO
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
 
+try:
+    # Optional Rust JSON parser for Claude responses (pip install orjson)
+    import orjson
+
+    _json_loads: Callable[..., Any] = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+from src.cache import ResultCache, screenshots_key
 from src.templates.registry import MechanicType, TEMPLATE_REGISTRY
 from .models import ConfidenceLevel
 
+# Formats Claude accepts that small screenshots are sent in unchanged
+_PASSTHROUGH_MEDIA_TYPES = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "WEBP": "image/webp",
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _prompt_digest(prompt: str) -> str:
+    """Short digest of an analysis prompt, computed once per prompt."""
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=8).hexdigest()
+
+
+# Shared stand-in for sections missing from a response (or null in it)
+_EMPTY: Mapping = MappingProxyType({})
+
+# JSON body of a markdown code block in Claude's response
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
+
 
 @dataclass
 class VisualStyle:
@@ -81,6 +117,18 @@ class GameAnalysis:
 class GameAnalyzer:
     """Analyzes game screenshots using Claude Vision."""
 
+    # Screenshots are downscaled and sent as JPEG: mechanic classification
+    # doesn't need full resolution, and Vision cost scales with pixel count.
+    MAX_SCREENSHOTS = 5
+    MAX_IMAGE_DIMENSION = 1024
+    JPEG_QUALITY = 85
+    # Small enough PNG/WebP screenshots are sent as-is instead of re-encoded
+    PASSTHROUGH_MAX_BYTES = 512 * 1024
+    # The analysis JSON is typically 500-900 tokens; a truncated response is
+    # retried once with the larger limit
+    MAX_TOKENS = 1200
+    RETRY_MAX_TOKENS = 2000
+
     ANALYSIS_PROMPT = """You are a mobile game analyst and playable ad specialist.
 
 Analyze these game screenshots and extract the following information:
@@ -172,16 +220,34 @@ Respond in this exact JSON format:
         self,
         api_key: Optional[str] = None,
         model: str = "claude-sonnet-4-20250514",
+        client=None,
+        cache: Optional[ResultCache] = None,
     ):
         """Initialize the game analyzer.
 
         Args:
             api_key: Anthropic API key. If None, uses ANTHROPIC_API_KEY env var.
             model: Claude model to use for analysis.
+            client: Existing anthropic.Anthropic client to share. Created on
+                first use if None.
+            cache: Cache for parsed responses, keyed on model, screenshots and
+                hint. Every call goes to Claude if None.
         """
-        import anthropic
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self._api_key = api_key
+        self._client = client
         self.model = model
+        self.cache = cache
+        # Cached analyses are only valid for the model and prompt that made them
+        self._cache_namespace = f"{model}:{_prompt_digest(self.ANALYSIS_PROMPT)}"
+        self._async_client = None  # Created on first async analysis
+
+    @property
+    def client(self):
+        """The Anthropic client, created on first use."""
+        if self._client is None:
+            import anthropic
+            self._client = anthropic.Anthropic(api_key=self._api_key)
+        return self._client
 
     def analyze_screenshots(
         self,
@@ -197,47 +263,145 @@ Respond in this exact JSON format:
         Returns:
             GameAnalysis with complete game information
         """
-        # Prepare images for Claude
-        image_content = []
-        for screenshot in screenshots:
-            image_data = self._prepare_image(screenshot)
-            image_content.append({
-                "type": "image",
-                "source": {
-                    "type": "base64",
-                    "media_type": "image/png",
-                    "data": image_data,
-                },
-            })
+        screenshots = screenshots[:self.MAX_SCREENSHOTS]
+        cache_key, cached = self._check_cache(screenshots, game_name_hint)
+        if cached is not None:
+            return cached
+
+        # Prepare images for Claude; Pillow releases the GIL while decoding
+        # and resizing, so several screenshots are prepared in parallel
+        if len(screenshots) > 1:
+            with ThreadPoolExecutor(max_workers=len(screenshots)) as pool:
+                prepared = list(pool.map(self._prepare_image, screenshots))
+        else:
+            prepared = [self._prepare_image(s) for s in screenshots]
+
+        # Call Claude Vision
+        request = self._build_request(prepared, game_name_hint)
+        message = self.client.messages.create(**request)
+        if message.stop_reason == "max_tokens":
+            message = self.client.messages.create(**self._retry_request(request))
+        return self._handle_response(message, cache_key)
+
+    async def analyze_screenshots_async(
+        self,
+        screenshots: list[bytes | Path | str],
+        game_name_hint: Optional[str] = None,
+    ) -> GameAnalysis:
+        """Analyze game screenshots without blocking the event loop.
 
+        Same as analyze_screenshots, but uses an AsyncAnthropic client so
+        many games can be analyzed concurrently with asyncio.gather.
+        """
+        screenshots = screenshots[:self.MAX_SCREENSHOTS]
+        # Cache lookups hash the screenshots and may read from disk
+        cache_key, cached = await asyncio.to_thread(
+            self._check_cache, screenshots, game_name_hint
+        )
+        if cached is not None:
+            return cached
+
+        prepared = await asyncio.gather(*(
+            asyncio.to_thread(self._prepare_image, s) for s in screenshots
+        ))
+
+        client = self._get_async_client()
+        request = self._build_request(prepared, game_name_hint)
+        message = await client.messages.create(**request)
+        if message.stop_reason == "max_tokens":
+            message = await client.messages.create(**self._retry_request(request))
+        # Off the loop too: caching the response may write to disk
+        return await asyncio.to_thread(self._handle_response, message, cache_key)
+
+    async def aclose(self) -> None:
+        """Close the async Anthropic client, if one was created."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    def _get_async_client(self):
+        """Get the async Anthropic client, creating it on first use."""
+        if self._async_client is None:
+            import anthropic
+            # Same credentials as the sync client, which may have been shared
+            api_key = self._client.api_key if self._client is not None else self._api_key
+            self._async_client = anthropic.AsyncAnthropic(api_key=api_key)
+        return self._async_client
+
+    def _check_cache(
+        self,
+        screenshots: list[bytes | Path | str],
+        game_name_hint: Optional[str],
+    ) -> tuple[Optional[str], Optional[GameAnalysis]]:
+        """Return (cache key, cached analysis); both None without a cache."""
+        if self.cache is None:
+            return None, None
+        cache_key = screenshots_key(screenshots, game_name_hint, model=self._cache_namespace)
+        data = self.cache.get(cache_key)
+        if data is None:
+            return cache_key, None
+        # The cache hands out a copy, so analyses never share raw_analysis
+        return cache_key, self._build_analysis(data)
+
+    def _build_request(
+        self,
+        prepared: list[tuple[str, str]],
+        game_name_hint: Optional[str],
+    ) -> dict:
+        """Build messages.create arguments from (media type, base64) images."""
         # Add hint if provided
         prompt = self.ANALYSIS_PROMPT
         if game_name_hint:
             prompt += f"\n\nHint: The game might be '{game_name_hint}'."
 
-        # Call Claude Vision
-        message = self.client.messages.create(
-            model=self.model,
-            max_tokens=2000,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        *image_content,
-                        {"type": "text", "text": prompt},
-                    ],
-                }
-            ],
+        content = [
+            {
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": media_type,
+                    "data": image_data,
+                },
+            }
+            for media_type, image_data in prepared
+        ]
+        content.append({"type": "text", "text": prompt})
+
+        return {
+            "model": self.model,
+            "max_tokens": self.MAX_TOKENS,
+            "messages": [{"role": "user", "content": content}],
+        }
+
+    def _retry_request(self, request: dict) -> dict:
+        """The same request with RETRY_MAX_TOKENS, after a truncated response."""
+        import structlog  # Imported lazily; only needed on this rare path
+
+        structlog.get_logger().warning(
+            "Analysis response hit max_tokens, retrying with a higher limit",
+            max_tokens=request["max_tokens"],
+            retry_max_tokens=self.RETRY_MAX_TOKENS,
         )
+        return {**request, "max_tokens": self.RETRY_MAX_TOKENS}
 
-        # Parse response
+    def _handle_response(self, message, cache_key: Optional[str]) -> GameAnalysis:
+        """Parse Claude's message, caching the decoded data under cache_key."""
         if not message.content:
             raise ValueError("Claude returned empty response")
         first_block = message.content[0]
         if not hasattr(first_block, "text") or not first_block.text:
             raise ValueError("Claude response had no text content")
         response_text = first_block.text
-        return self._parse_analysis(response_text)
+
+        try:
+            data = self._decode_response(response_text)
+        except json.JSONDecodeError as e:  # orjson's error subclasses this
+            # Fallback: try to extract what we can; not cached so a retry can do better
+            return self._create_fallback_analysis(response_text, str(e))
+
+        if self.cache is not None and cache_key is not None:
+            self.cache.put(cache_key, data)  # Stored as a copy
+        return self._build_analysis(data)
 
     def analyze_from_files(
         self,
@@ -263,42 +427,81 @@ Respond in this exact JSON format:
 
         return self.analyze_screenshots(screenshots, game_name_hint)
 
-    def _prepare_image(self, image: bytes | Path | str) -> str:
-        """Convert image to base64 string."""
+    def _prepare_image(self, image: bytes | Path | str) -> tuple[str, str]:
+        """Convert image to (media type, base64 string), downscaling if needed."""
         if isinstance(image, bytes):
-            return base64.standard_b64encode(image).decode("utf-8")
+            raw = image
         elif isinstance(image, Path):
-            return base64.standard_b64encode(image.read_bytes()).decode("utf-8")
+            raw = image.read_bytes()
         elif isinstance(image, str):
             # Assume it's already base64 or a file path
-            path = Path(image)
-            if path.exists():
-                return base64.standard_b64encode(path.read_bytes()).decode("utf-8")
-            # Assume it's base64
-            return image
+            try:
+                is_file = Path(image).is_file()
+            except (OSError, ValueError):
+                is_file = False  # Too long to be a path
+            if is_file:
+                raw = Path(image).read_bytes()
+            else:
+                # Assume it's base64; decoded so it is downscaled like the rest
+                try:
+                    raw = base64.b64decode(image, validate=True)
+                except binascii.Error:
+                    return "image/png", image
         else:
             raise ValueError(f"Unsupported image type: {type(image)}")
 
-    def _parse_analysis(self, response_text: str) -> GameAnalysis:
-        """Parse Claude's JSON response into GameAnalysis."""
-        # Extract JSON from response (handle markdown code blocks)
-        json_str = response_text
-        json_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", response_text)
-        if json_match:
-            json_str = json_match.group(1).strip()
+        media_type, raw = self._downscale_image(raw)
+        return media_type, base64.standard_b64encode(raw).decode("utf-8")
 
-        try:
-            data = json.loads(json_str)
-        except json.JSONDecodeError as e:
-            # Fallback: try to extract what we can
-            return self._create_fallback_analysis(response_text, str(e))
+    def _downscale_image(self, raw: bytes) -> tuple[str, bytes]:
+        """Shrink a screenshot to MAX_IMAGE_DIMENSION and re-encode as JPEG.
+
+        Small JPEGs, and PNG/WebP files under PASSTHROUGH_MAX_BYTES, pass
+        through untouched; bytes Pillow can't read, or won't because they
+        exceed its decompression-bomb limit, are sent as-is, as before.
+        """
+        from PIL import Image, UnidentifiedImageError
 
+        try:
+            with BytesIO(raw) as input_buffer:
+                source = Image.open(input_buffer)
+                # Only the header has been read so far
+                if max(source.size) <= self.MAX_IMAGE_DIMENSION and (
+                    source.format == "JPEG" or len(raw) <= self.PASSTHROUGH_MAX_BYTES
+                ):
+                    media_type = _PASSTHROUGH_MEDIA_TYPES.get(source.format or "")
+                    if media_type is not None:
+                        return media_type, raw
+                source.draft("RGB", (self.MAX_IMAGE_DIMENSION, self.MAX_IMAGE_DIMENSION))
+                img = source.convert("RGB")
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+            return "image/png", raw
+
+        img.thumbnail(
+            (self.MAX_IMAGE_DIMENSION, self.MAX_IMAGE_DIMENSION),
+            Image.Resampling.LANCZOS,
+        )
+        with BytesIO() as output_buffer:
+            # No exif= argument, so metadata is stripped
+            img.save(output_buffer, format="JPEG", quality=self.JPEG_QUALITY, optimize=True)
+            return "image/jpeg", output_buffer.getvalue()
+
+    @staticmethod
+    def _decode_response(response_text: str) -> dict:
+        """Decode the JSON in Claude's response (inside a markdown code block if any)."""
+        json_match = _JSON_FENCE_RE.search(response_text)
+        json_str = json_match.group(1).strip() if json_match else response_text
+        data: dict = _json_loads(json_str)
+        return data
+
+    def _build_analysis(self, data: dict) -> GameAnalysis:
+        """Build a GameAnalysis from decoded response data."""
         # Parse mechanic type
         mechanic_str = data.get("mechanic_type", "UNKNOWN")
         mechanic_type = MechanicType.from_string(mechanic_str)
 
         # Parse visual style
-        style_data = data.get("visual_style", {})
+        style_data = data.get("visual_style") or _EMPTY
         visual_style = VisualStyle(
             art_type=style_data.get("art_type", "cartoon"),
             color_palette=style_data.get("color_palette", ["#FF6B6B", "#4ECDC4"]),
@@ -308,7 +511,7 @@ Respond in this exact JSON format:
 
         # Parse assets needed
         assets_needed = []
-        for asset_data in data.get("assets_needed", []):
+        for asset_data in data.get("assets_needed") or ():
             assets_needed.append(AssetNeed(
                 key=asset_data.get("key", "unknown"),
                 description=asset_data.get("description", ""),
@@ -321,7 +524,7 @@ Respond in this exact JSON format:
         default_config = template.get_default_config() if template else {}
 
         # Merge with analyzed config
-        template_config = {**default_config, **data.get("template_config", {})}
+        template_config = {**default_config, **(data.get("template_config") or _EMPTY)}
 
         return GameAnalysis(
             game_name=data.get("game_name", "Unknown Game"),
@@ -377,8 +580,10 @@ class GameAnalyzerSync:
         self,
         api_key: Optional[str] = None,
         model: str = "claude-sonnet-4-20250514",
+        client=None,
+        cache: Optional[ResultCache] = None,
     ):
-        self._analyzer = GameAnalyzer(api_key=api_key, model=model)
+        self._analyzer = GameAnalyzer(api_key=api_key, model=model, client=client, cache=cache)
 
     def analyze_screenshots(
         self,
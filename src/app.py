@@ -24,16 +24,21 @@ from typing import Optional
 import streamlit as st
 
 from src.analysis.game_analyzer import GameAnalyzerSync, GameAnalysis
-from src.generation.game_asset_generator import GameAssetGenerator, GeneratedAssetSet
-from src.assembly.builder import PlayableBuilder, PlayableConfig, PlayableResult
+from src.cache import ResultCache
+from src.generation.game_asset_generator import (
+    AssetDiskCache, GameAssetGenerator, GeneratedAssetSet,
+)
+from src.assembly.builder import (
+    PlayableBuilder, PlayableConfig, PlayableResult, ZIP_COMPRESSLEVEL,
+)
 from src.layer_client import LayerClientSync, LayerAPIError, extract_error_message
 from src.templates.registry import MechanicType, TEMPLATE_REGISTRY, list_available_mechanics
 from src.utils.helpers import validate_api_keys, get_settings
 from src.ui_components import (
-    glass_card, step_header, metric_card, confidence_badge, color_palette,
+    glass_card, step_header, metric_row, confidence_badge, color_palette,
     asset_preview_card, network_badges, success_banner, empty_state,
     sidebar_progress, api_status_row, credits_display, phone_preview,
-    gradient_divider, styled_pill, onboarding_card,
+    GRADIENT_DIVIDER, styled_pill, onboarding_card,
 )
 
 
@@ -41,6 +46,12 @@ from src.ui_components import (
 # Cached Functions
 # =============================================================================
 
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    """Result cache shared by every session in this process."""
+    return ResultCache.from_settings()
+
+
 @st.cache_data(ttl=300, show_spinner="Connecting to Layer.ai...")
 def fetch_workspace_info() -> Optional[dict]:
     """Fetch workspace info with caching."""
@@ -226,7 +237,7 @@ def render_sidebar():
     """, unsafe_allow_html=True)
 
     # API Status
-    st.sidebar.markdown(gradient_divider(), unsafe_allow_html=True)
+    st.sidebar.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
     st.sidebar.markdown('<div style="font-size:0.72rem;text-transform:uppercase;letter-spacing:0.08em;color:#636e7b;margin-bottom:8px;">API Status</div>', unsafe_allow_html=True)
 
     key_status = validate_api_keys()
@@ -237,9 +248,10 @@ def render_sidebar():
         "layer_workspace_id": "Workspace ID",
         "anthropic_api_key": "Anthropic API",
     }
-    for key, is_set in key_status.items():
-        name = key_labels.get(key, key.replace("_", " ").title())
-        st.sidebar.markdown(api_status_row(name, is_set), unsafe_allow_html=True)
+    st.sidebar.markdown("".join(
+        api_status_row(key_labels.get(key, key.replace("_", " ").title()), is_set).strip()
+        for key, is_set in key_status.items()
+    ), unsafe_allow_html=True)
 
     if all_keys_set:
         info = fetch_workspace_info()
@@ -250,12 +262,12 @@ def render_sidebar():
                 st.sidebar.markdown(credits_display(info.get("credits_available", "?")), unsafe_allow_html=True)
 
     # Workflow Progress
-    st.sidebar.markdown(gradient_divider(), unsafe_allow_html=True)
+    st.sidebar.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
     st.sidebar.markdown('<div style="font-size:0.72rem;text-transform:uppercase;letter-spacing:0.08em;color:#636e7b;margin-bottom:8px;">Workflow</div>', unsafe_allow_html=True)
     st.sidebar.markdown(sidebar_progress(st.session_state.current_step), unsafe_allow_html=True)
 
     # Supported Games
-    st.sidebar.markdown(gradient_divider(), unsafe_allow_html=True)
+    st.sidebar.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
     st.sidebar.markdown('<div style="font-size:0.72rem;text-transform:uppercase;letter-spacing:0.08em;color:#636e7b;margin-bottom:8px;">Supported Games</div>', unsafe_allow_html=True)
 
     pills_html = ""
@@ -265,7 +277,7 @@ def render_sidebar():
     st.sidebar.markdown(f'<div style="display:flex;flex-wrap:wrap;gap:4px;">{pills_html}</div>', unsafe_allow_html=True)
 
     # Demo Mode
-    st.sidebar.markdown(gradient_divider(), unsafe_allow_html=True)
+    st.sidebar.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
     st.sidebar.markdown(glass_card(
         title="Quick Demo",
         icon="&#9889;",
@@ -341,7 +353,7 @@ def render_step_1():
         if st.button("Analyze Game", type="primary"):
             with st.spinner("Analyzing game with Claude Vision..."):
                 try:
-                    analyzer = GameAnalyzerSync()
+                    analyzer = GameAnalyzerSync(cache=get_result_cache())
                     analysis = analyzer.analyze_screenshots(
                         st.session_state.screenshots,
                         game_name_hint=game_name if game_name else None,
@@ -427,7 +439,7 @@ def render_step_2():
         ), unsafe_allow_html=True)
 
     # Allow override of mechanic type
-    st.markdown(gradient_divider(), unsafe_allow_html=True)
+    st.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
 
     mechanic_options = [m.value for m in list_available_mechanics()]
     current_index = mechanic_options.index(analysis.mechanic_type.value) if analysis.mechanic_type.value in mechanic_options else 0
@@ -465,7 +477,7 @@ def render_step_2():
         ), unsafe_allow_html=True)
 
     # Assets needed
-    st.markdown(gradient_divider(), unsafe_allow_html=True)
+    st.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
 
     if analysis.assets_needed:
         assets_content = ""
@@ -495,7 +507,7 @@ def render_step_2():
         ), unsafe_allow_html=True)
 
     # Navigation
-    st.markdown(gradient_divider(), unsafe_allow_html=True)
+    st.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
     col1, col2 = st.columns([1, 2])
 
     with col1:
@@ -555,7 +567,7 @@ def render_step_3():
             st.warning("No completed styles found")
 
     # Show what will be generated as styled cards
-    st.markdown(gradient_divider(), unsafe_allow_html=True)
+    st.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
 
     template = TEMPLATE_REGISTRY[mechanic_type]
     required_assets = [a for a in template.required_assets if a.required]
@@ -581,7 +593,7 @@ def render_step_3():
     ), unsafe_allow_html=True)
 
     # Navigation
-    st.markdown(gradient_divider(), unsafe_allow_html=True)
+    st.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
     col1, col2 = st.columns([1, 2])
 
     with col1:
@@ -595,8 +607,6 @@ def render_step_3():
         if st.button("Generate Assets", type="primary", disabled=not can_generate):
             with st.spinner("Generating assets with Layer.ai..."):
                 try:
-                    generator = GameAssetGenerator()
-
                     # Progress display
                     progress = st.progress(0)
                     status = st.empty()
@@ -605,11 +615,12 @@ def render_step_3():
                         progress.progress(current / total)
                         status.text(f"Generating {name}...")
 
-                    asset_set = generator.generate_for_game(
-                        analysis=analysis,
-                        style_id=st.session_state.layer_style_id,
-                        progress_callback=progress_callback,
-                    )
+                    with GameAssetGenerator(cache=AssetDiskCache.from_settings()) as generator:
+                        asset_set = generator.generate_for_game(
+                            analysis=analysis,
+                            style_id=st.session_state.layer_style_id,
+                            progress_callback=progress_callback,
+                        )
 
                     st.session_state.generated_assets = asset_set
                     st.session_state.current_step = 4
@@ -686,7 +697,7 @@ def render_step_4():
 
     # Configuration (skip build options in demo mode - already built)
     if not is_demo_mode:
-        st.markdown(gradient_divider(), unsafe_allow_html=True)
+        st.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
 
         col1, col2 = st.columns(2)
 
@@ -725,7 +736,7 @@ def render_step_4():
             width, height = 480, 320
 
         # Build button
-        st.markdown(gradient_divider(), unsafe_allow_html=True)
+        st.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
         col1, col2 = st.columns([1, 2])
 
         with col1:
@@ -763,7 +774,7 @@ def render_step_4():
     if st.session_state.playable_result:
         result: PlayableResult = st.session_state.playable_result
 
-        st.markdown(gradient_divider(), unsafe_allow_html=True)
+        st.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
         st.markdown(success_banner(
             "Playable Ready",
             "Your ad is built and ready for download.",
@@ -773,16 +784,13 @@ def render_step_4():
         size_status = "success" if result.file_size_mb <= 5 else "error"
         valid_status = "success" if result.is_valid else "warning"
 
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.markdown(metric_card("File Size", result.file_size_formatted, status=size_status), unsafe_allow_html=True)
-        with col2:
-            st.markdown(metric_card("Assets", str(result.assets_embedded)), unsafe_allow_html=True)
-        with col3:
-            st.markdown(metric_card("Mechanic", result.mechanic_type.value), unsafe_allow_html=True)
-        with col4:
-            status_val = "Valid" if result.is_valid else "Issues"
-            st.markdown(metric_card("Status", status_val, status=valid_status), unsafe_allow_html=True)
+        status_val = "Valid" if result.is_valid else "Issues"
+        st.markdown(metric_row([
+            ("File Size", result.file_size_formatted, "", size_status),
+            ("Assets", str(result.assets_embedded)),
+            ("Mechanic", result.mechanic_type.value),
+            ("Status", status_val, "", valid_status),
+        ]), unsafe_allow_html=True)
 
         if result.validation_errors:
             for error in result.validation_errors:
@@ -796,7 +804,7 @@ def render_step_4():
         ), unsafe_allow_html=True)
 
         # Downloads
-        st.markdown(gradient_divider(), unsafe_allow_html=True)
+        st.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
 
         st.markdown(glass_card(
             title="Download",
@@ -809,12 +817,15 @@ def render_step_4():
             accent="var(--color-success)",
         ), unsafe_allow_html=True)
 
+        # Encode once; the HTML download, ZIP and preview all reuse these bytes
+        html_bytes = result.html.encode("utf-8")
+
         col1, col2 = st.columns(2)
 
         with col1:
             st.download_button(
                 label="Download index.html",
-                data=result.html,
+                data=html_bytes,
                 file_name="index.html",
                 mime="text/html",
             )
@@ -825,8 +836,10 @@ def render_step_4():
             import zipfile
 
             zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-                zf.writestr("index.html", result.html)
+            with zipfile.ZipFile(
+                zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL
+            ) as zf:
+                zf.writestr("index.html", html_bytes)
             zip_data = zip_buffer.getvalue()
 
             st.download_button(
@@ -837,13 +850,13 @@ def render_step_4():
             )
 
         # Preview in phone mockup
-        st.markdown(gradient_divider(), unsafe_allow_html=True)
+        st.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
         if st.checkbox("Show Preview"):
-            b64 = base64.b64encode(result.html.encode()).decode()
+            b64 = base64.b64encode(html_bytes).decode()
             st.markdown(phone_preview(b64, width=320, height=480), unsafe_allow_html=True)
 
         # Start over
-        st.markdown(gradient_divider(), unsafe_allow_html=True)
+        st.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
         if st.button("Create Another Playable"):
             for key in ["screenshots", "game_analysis", "selected_mechanic",
                        "layer_style_id", "generated_assets", "playable_result"]:
@@ -870,7 +883,7 @@ def main():
         </div>
     </div>
     """, unsafe_allow_html=True)
-    st.markdown(gradient_divider(), unsafe_allow_html=True)
+    st.markdown(GRADIENT_DIVIDER, unsafe_allow_html=True)
 
     # Check if we're in demo mode (step 4 with playable result but no assets)
     is_demo_mode = (
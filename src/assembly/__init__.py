@@ -10,10 +10,20 @@ from .builder import (
     PlayableBuilder,
     PlayableConfig,
     PlayableResult,
+    ValidationCode,
+    ValidationError,
+    utf8_size,
+    write_html_file,
+    write_html_zip,
 )
 
 __all__ = [
     "PlayableBuilder",
     "PlayableConfig",
     "PlayableResult",
+    "ValidationCode",
+    "ValidationError",
+    "utf8_size",
+    "write_html_file",
+    "write_html_zip",
 ]
@@ -8,11 +8,24 @@ This module:
 - Validates size and compliance
 """
 
+import functools
 import json
 import re
+import zipfile
 from dataclasses import dataclass, field
+from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import IO, BinaryIO, Optional
+
+try:
+    # Optional Rust JSON encoder for large manifests (pip install orjson)
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj)
 
 from src.analysis.game_analyzer import GameAnalysis
 from src.generation.game_asset_generator import GeneratedAssetSet
@@ -25,14 +38,115 @@ PHASER_CDN = '<script src="https://cdn.jsdelivr.net/npm/phaser@3.70.0/dist/phase
 
 # Sound effects script (procedural Web Audio API sounds)
 SOUND_FX_SCRIPT = f'<script>\n{PROCEDURAL_SOUNDS_JS}\n</script>'
+PHASER_SCRIPT_WITH_SOUND = f"{PHASER_CDN}\n{SOUND_FX_SCRIPT}"
 
 # Timing constants (milliseconds)
 HOOK_DURATION_MS = 3000
 GAMEPLAY_DURATION_MS = 15000
 CTA_DURATION_MS = 5000
 
+# ZIP deflate level. Playables are mostly base64 of already-compressed images,
+# which still shrinks ~25% from entropy coding alone; higher levels add CPU
+# for under 2% extra savings.
+ZIP_COMPRESSLEVEL = 1
+
+# Characters encoded per write when saving HTML, bounding the bytes copy
+HTML_WRITE_CHUNK_CHARS = 1 << 20
+
+# Template placeholders that must not survive substitution
+KNOWN_PLACEHOLDERS = (
+    "${TITLE}", "${GAME_NAME}", "${STORE_URL}", "${ASSET_MANIFEST}",
+    "${PHASER_SCRIPT}", "${HOOK_TEXT}", "${CTA_TEXT}", "${BACKGROUND_COLOR}",
+    "${HOOK_DURATION}", "${GAMEPLAY_DURATION}", "${CTA_DURATION}",
+)
+
+# ${NAME} placeholder in a template file
+_PLACEHOLDER_RE = re.compile(r"\$\{(\w+)\}")
+
+# The asset manifest as _manifest_js emits it: a JSON object, or a function
+# expression when shared data URIs are hoisted into local variables
+_ASSETS_RE = re.compile(
+    r"var\s+ASSETS\s*=\s*(\{.*?\}|\(function\(\)\{.*?\}\)\(\));", re.DOTALL
+)
+
+
+def _write_chunked(html: str, f: IO[bytes]) -> None:
+    """Encode and write html in slices, never holding a full UTF-8 copy."""
+    for start in range(0, len(html), HTML_WRITE_CHUNK_CHARS):
+        f.write(html[start:start + HTML_WRITE_CHUNK_CHARS].encode("utf-8"))
+
+
+def utf8_size(html: str) -> int:
+    """UTF-8 size of html without building a full encoded copy.
 
-@dataclass
+    Assembled playables are mostly ASCII (base64 assets, JS), where the
+    size is just the length; otherwise slices are encoded and counted.
+    """
+    if html.isascii():
+        return len(html)
+    return sum(
+        len(html[start:start + HTML_WRITE_CHUNK_CHARS].encode("utf-8"))
+        for start in range(0, len(html), HTML_WRITE_CHUNK_CHARS)
+    )
+
+
+def write_html_file(html: str, output_path: Path) -> None:
+    """Write playable HTML to a UTF-8 file."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("wb") as f:
+        _write_chunked(html, f)
+
+
+def write_html_zip(html: str, output_path: Path | BinaryIO) -> None:
+    """Write playable HTML as index.html inside a ZIP (for Google Ads).
+
+    output_path may also be a writable binary file object (e.g. BytesIO).
+    """
+    if isinstance(output_path, Path):
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(
+        output_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL
+    ) as zf, zf.open("index.html", "w") as f:
+        _write_chunked(html, f)
+
+
+@functools.cache
+def _load_template(template_path: Path) -> tuple[tuple[str, ...], tuple[tuple[str, str], ...]]:
+    """Read and compile a template file once; templates are immutable at runtime.
+
+    Returns the literal segments and, between each pair of them, the
+    placeholder as (name, original text). Substitution is then a join.
+    Only the braced ${NAME} form is a placeholder; "$$" and bare "$NAME"
+    are literal text, as inline JS may contain them.
+    """
+    if not template_path.exists():
+        raise FileNotFoundError(f"Template not found: {template_path}")
+    parts = _PLACEHOLDER_RE.split(template_path.read_text(encoding="utf-8"))
+    # split() alternates literal text and captured placeholder names
+    names = parts[1::2]
+    return tuple(parts[::2]), tuple((name, f"${{{name}}}") for name in names)
+
+
+def _manifest_js(asset_manifest: dict[str, str]) -> str:
+    """Serialize the asset manifest as a JS expression for ``var ASSETS = ...``.
+
+    Data URIs shared by several keys are emitted once as local variables and
+    referenced by name, so the HTML grows with unique images rather than keys.
+    """
+    uri_vars: dict[str, str] = {}
+    for uri in asset_manifest.values():
+        uri_vars.setdefault(uri, f"_u{len(uri_vars)}")
+    if len(uri_vars) == len(asset_manifest):
+        return _json_dumps(asset_manifest)
+
+    decls = ",".join(f"{var}={_json_dumps(uri)}" for uri, var in uri_vars.items())
+    entries = ", ".join(
+        f"{_json_dumps(key)}: {uri_vars[uri]}" for key, uri in asset_manifest.items()
+    )
+    return f"(function(){{var {decls};return {{{entries}}};}})()"
+
+
+@dataclass(slots=True)
 class PlayableConfig:
     """Configuration for playable ad assembly."""
 
@@ -63,7 +177,27 @@ class PlayableConfig:
     sound_enabled: bool = True
 
 
-@dataclass
+class ValidationCode(str, Enum):
+    """Reasons an assembled playable fails validation."""
+
+    SIZE_EXCEEDED = "size_exceeded"
+    MISSING_STORE_URL = "missing_store_url"
+    UNSUBSTITUTED_PLACEHOLDERS = "unsubstituted_placeholders"
+    EXTERNAL_ASSET_URLS = "external_asset_urls"
+
+
+@dataclass(slots=True, frozen=True)
+class ValidationError:
+    """A single validation failure: a stable code plus a readable message."""
+
+    code: ValidationCode
+    message: str
+
+    def __str__(self) -> str:
+        return self.message
+
+
+@dataclass(slots=True)
 class PlayableResult:
     """Result of playable assembly."""
 
@@ -127,12 +261,8 @@ class PlayableBuilder:
             # Fall back to tapper
             template_info = TEMPLATE_REGISTRY[MechanicType.TAPPER]
 
-        # Load template HTML
-        template_path = template_info.get_template_path()
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template not found: {template_path}")
-
-        template_html = template_path.read_text(encoding="utf-8")
+        # Load compiled template
+        template = _load_template(template_info.get_template_path())
 
         # Merge config with analysis suggestions
         final_config = self._merge_config(analysis, config)
@@ -151,13 +281,13 @@ class PlayableBuilder:
         )
 
         # Perform substitution
-        html = self._substitute_template(template_html, substitutions)
+        html = self._substitute_template(template, substitutions)
 
-        # Validate
-        errors = self._validate(html)
+        # Calculate size once; validation reuses it
+        size_bytes = utf8_size(html)
 
-        # Calculate size
-        size_bytes = len(html.encode("utf-8"))
+        # Validate
+        errors = self._validate(html, size_bytes)
 
         return PlayableResult(
             html=html,
@@ -165,7 +295,7 @@ class PlayableBuilder:
             mechanic_type=analysis.mechanic_type,
             assets_embedded=len(asset_manifest),
             is_valid=len(errors) == 0,
-            validation_errors=errors,
+            validation_errors=[e.message for e in errors],
         )
 
     def build_from_template(
@@ -273,10 +403,10 @@ class PlayableBuilder:
             "CTA_TEXT": config.cta_text,
 
             # Assets
-            "ASSET_MANIFEST": json.dumps(asset_manifest),
+            "ASSET_MANIFEST": _manifest_js(asset_manifest),
 
             # Phaser script + Sound effects
-            "PHASER_SCRIPT": PHASER_CDN + ("\n" + SOUND_FX_SCRIPT if config.sound_enabled else ""),
+            "PHASER_SCRIPT": PHASER_SCRIPT_WITH_SOUND if config.sound_enabled else PHASER_CDN,
         }
 
         # Add template-specific config
@@ -285,55 +415,78 @@ class PlayableBuilder:
 
         return subs
 
-    def _substitute_template(self, template_html: str, subs: dict[str, str]) -> str:
-        """Perform template substitution using ${VAR} style placeholders."""
-        result = template_html
-        for key, value in subs.items():
-            result = result.replace(f"${{{key}}}", value)
-        return result
+    def _substitute_template(
+        self,
+        template: tuple[tuple[str, ...], tuple[tuple[str, str], ...]],
+        subs: dict[str, str],
+    ) -> str:
+        """Perform template substitution using ${VAR} style placeholders.
+
+        Joins the precompiled literal segments with their values in one
+        pass; unknown placeholders are left as-is. The output matches a
+        str.replace of each ${KEY}, except that inserted values are never
+        themselves scanned for placeholders.
+        """
+        literals, placeholders = template
+        parts: list[str] = [""] * (len(literals) + len(placeholders))
+        parts[::2] = literals
+        parts[1::2] = [
+            original if (value := subs.get(name)) is None else str(value)
+            for name, original in placeholders
+        ]
+        return "".join(parts)
+
+    def _validate(
+        self, html: str, size_bytes: Optional[int] = None
+    ) -> list[ValidationError]:
+        """Validate the assembled playable.
 
-    def _validate(self, html: str) -> list[str]:
-        """Validate the assembled playable."""
+        Args:
+            html: Assembled HTML
+            size_bytes: Precomputed UTF-8 size of html, if already known
+        """
         errors = []
 
         # Check size
-        size_mb = len(html.encode("utf-8")) / (1024 * 1024)
+        if size_bytes is None:
+            size_bytes = utf8_size(html)
+        size_mb = size_bytes / (1024 * 1024)
         if size_mb > self.MAX_SIZE_MB:
-            errors.append(f"File size {size_mb:.2f}MB exceeds {self.MAX_SIZE_MB}MB limit")
+            errors.append(ValidationError(
+                ValidationCode.SIZE_EXCEEDED,
+                f"File size {size_mb:.2f}MB exceeds {self.MAX_SIZE_MB}MB limit",
+            ))
 
         # Check for required elements
         if "openStoreUrl" not in html:
-            errors.append("Missing openStoreUrl function")
+            errors.append(ValidationError(
+                ValidationCode.MISSING_STORE_URL, "Missing openStoreUrl function"
+            ))
 
         # Check for known template placeholders that should have been replaced
-        known_placeholders = [
-            "${TITLE}", "${GAME_NAME}", "${STORE_URL}", "${ASSET_MANIFEST}",
-            "${PHASER_SCRIPT}", "${HOOK_TEXT}", "${CTA_TEXT}", "${BACKGROUND_COLOR}",
-            "${HOOK_DURATION}", "${GAMEPLAY_DURATION}", "${CTA_DURATION}",
-        ]
-        remaining = [p for p in known_placeholders if p in html]
+        remaining = [p for p in KNOWN_PLACEHOLDERS if p in html]
         if remaining:
-            errors.append(f"Unsubstituted template variables found: {remaining}")
+            errors.append(ValidationError(
+                ValidationCode.UNSUBSTITUTED_PLACEHOLDERS,
+                f"Unsubstituted template variables found: {remaining}",
+            ))
 
         # Check that asset manifest doesn't contain external URLs (XSS prevention)
-        asset_section = re.search(r"var\s+ASSETS\s*=\s*(\{.*?\});", html, re.DOTALL)
+        asset_section = _ASSETS_RE.search(html)
         if asset_section:
             asset_json = asset_section.group(1)
             if re.search(r"https?://", asset_json):
-                errors.append("Asset manifest contains external URLs (expected data URIs only)")
+                errors.append(ValidationError(
+                    ValidationCode.EXTERNAL_ASSET_URLS,
+                    "Asset manifest contains external URLs (expected data URIs only)",
+                ))
 
         return errors
 
     def export_html(self, result: PlayableResult, output_path: Path) -> None:
         """Export playable to HTML file."""
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(result.html, encoding="utf-8")
+        write_html_file(result.html, output_path)
 
     def export_zip(self, result: PlayableResult, output_path: Path) -> None:
         """Export playable as ZIP (for Google Ads)."""
-        import zipfile
-
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr("index.html", result.html)
+        write_html_zip(result.html, output_path)
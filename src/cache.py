@@ -0,0 +1,277 @@
+"""
+Result Cache - Content-addressed cache for expensive pipeline results.
+
+Caches decoded Claude Vision analysis responses and GeneratedAssetSet
+(Layer.ai) results keyed by a hash of their inputs, so re-running the
+factory with identical screenshots or the same analysis and style skips
+the API calls.
+
+Two tiers:
+- In-process LRU (bounded by max_entries)
+- Optional on-disk pickle files shared across runs (bounded by max_entries
+  and max_bytes)
+
+Entries older than ttl_seconds are treated as misses in both tiers. Disk
+entries are namespaced by CACHE_SCHEMA_VERSION, so bumping it when a cached
+type changes shape orphans the old pickles instead of loading them.
+
+Disk entries are pickles, and unpickling can run arbitrary code: the cache
+directory must only be writable by the user running the pipeline.
+"""
+
+import contextlib
+import copy
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import orjson  # Optional speedup: serializes dataclasses natively
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from blake3 import blake3 as _blake3  # Optional speedup: SIMD hashing
+except ImportError:
+    _blake3 = None
+
+# Bump when a cached type (analysis response, GeneratedAssetSet, ...) changes shape
+CACHE_SCHEMA_VERSION = 2
+
+# Read size when hashing screenshot files
+HASH_CHUNK_SIZE = 1024 * 1024
+# Screenshots are hashed in parallel; both hashers release the GIL
+MAX_HASH_WORKERS = 8
+
+
+def _is_file(value: str | Path) -> bool:
+    try:
+        return Path(value).is_file()
+    except (OSError, ValueError):
+        return False  # e.g. a base64 string too long to be a path
+
+
+def _new_hasher():
+    if _blake3 is not None:
+        return _blake3()
+    return hashlib.blake2b(digest_size=16)
+
+
+def _screenshot_digest(screenshot: bytes | str | Path) -> bytes:
+    hasher = _new_hasher()
+    if isinstance(screenshot, bytes):
+        hasher.update(screenshot)
+    elif _is_file(screenshot):
+        with Path(screenshot).open("rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                hasher.update(chunk)
+    else:
+        # Base64 string passed straight through to the analyzer
+        hasher.update(str(screenshot).encode("utf-8"))
+    digest: bytes = hasher.digest()
+    return digest
+
+
+def screenshots_key(
+    screenshots: list[bytes | str | Path],
+    game_name_hint: Optional[str] = None,
+    model: Optional[str] = None,
+) -> str:
+    """Cache key for a game analysis: digest of screenshot contents and hint.
+
+    Each screenshot is hashed on its own (in parallel when there are
+    several) and the key is a digest of those digests, in order. Passing
+    the model keeps analyses from different models apart.
+    """
+    if len(screenshots) > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_HASH_WORKERS, len(screenshots))) as pool:
+            digests = list(pool.map(_screenshot_digest, screenshots))
+    else:
+        digests = [_screenshot_digest(s) for s in screenshots]
+
+    digest = hashlib.blake2b(b"analysis", digest_size=16)
+    for screenshot_digest in digests:
+        digest.update(screenshot_digest)
+    digest.update((game_name_hint or "").encode("utf-8"))
+    if model:
+        digest.update(b"\0" + model.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def assets_key(analysis: Any, style_id: str) -> str:
+    """Cache key for a generated asset set: digest of the analysis and style."""
+    if orjson is not None:
+        payload = orjson.dumps(
+            analysis, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+    else:
+        payload = json.dumps(asdict(analysis), sort_keys=True, default=str).encode("utf-8")
+    digest = hashlib.blake2b(b"assets", digest_size=16)
+    digest.update(payload)
+    digest.update(style_id.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Two-tier (memory + disk) LRU cache with a time-to-live."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_entries: int = 500,
+        ttl_seconds: float = 24 * 3600,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory for persisted entries (trusted: they are
+                unpickled on load). Memory-only if None.
+            max_entries: Max entries kept in memory and on disk.
+            ttl_seconds: Age after which an entry is ignored.
+            max_bytes: Max total size of the persisted entries.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._memory: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()  # Factories may run pipelines in threads
+        self._hits = 0
+        self._misses = 0
+        # Running (entries, bytes) on disk, so _store() only scans when needed
+        self._disk_usage: Optional[tuple[int, int]] = None
+
+    @classmethod
+    def from_settings(cls) -> "ResultCache":
+        """Create the cache configured in settings."""
+        from src.utils.helpers import get_settings
+
+        settings = get_settings()
+        return cls(
+            cache_dir=Path(settings.result_cache_dir) if settings.result_cache_dir else None,
+            ttl_seconds=settings.result_cache_ttl_hours * 3600,
+            max_bytes=settings.result_cache_max_mb * 1024 * 1024,
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is None:
+            entry = self._load(key)
+        with self._lock:
+            if entry is not None and now - entry[0] <= self.ttl_seconds:
+                self._remember(key, entry)
+                self._hits += 1
+                # A copy, so callers can't mutate what later hits return
+                return copy.deepcopy(entry[1])
+
+            self._memory.pop(key, None)
+            self._misses += 1
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a copy of value in memory and, if configured, on disk."""
+        entry = (time.time(), copy.deepcopy(value))
+        with self._lock:
+            self._remember(key, entry)
+        if self.cache_dir is not None:
+            self._store(self.cache_dir, key, entry)
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters and current in-memory size."""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "entries": len(self._memory),
+        }
+
+    def _remember(self, key: str, entry: tuple[float, Any]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _path(cache_dir: Path, key: str) -> Path:
+        return cache_dir / f"v{CACHE_SCHEMA_VERSION}-{key}.pkl"
+
+    def _load(self, key: str) -> Optional[tuple[float, Any]]:
+        if self.cache_dir is None:
+            return None
+        try:
+            with self._path(self.cache_dir, key).open("rb") as f:
+                entry = pickle.load(f)
+        except Exception:
+            # Missing, truncated, or pickled from classes that have since
+            # changed; unpickling can raise almost anything, all of it a miss
+            return None
+        if not (isinstance(entry, tuple) and len(entry) == 2):
+            return None
+        return entry
+
+    def _store(self, cache_dir: Path, key: str, entry: tuple[float, Any]) -> None:
+        try:
+            payload = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return  # Unpicklable values are only kept in memory
+
+        tmp_path = None
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self._path(cache_dir, key))
+            tmp_path = None
+        except OSError:
+            return
+        finally:
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+
+        with self._lock:
+            if self._disk_usage is not None:
+                count, total = self._disk_usage
+                self._disk_usage = count, total = count + 1, total + len(payload)
+                if count <= self.max_entries and total <= self.max_bytes:
+                    return
+        self._evict(cache_dir)
+
+    def _evict(self, cache_dir: Path) -> None:
+        """Drop the oldest entries until the directory fits both limits.
+
+        Also removes entries left behind by an older CACHE_SCHEMA_VERSION.
+        """
+        try:
+            entries = sorted(
+                ((p, p.stat()) for p in cache_dir.glob("*.pkl")),
+                key=lambda e: e[1].st_mtime,
+            )
+        except OSError:
+            return
+        count = len(entries)
+        total = sum(st.st_size for _, st in entries)
+        for path, st in entries:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            count -= 1
+            total -= st.st_size
+        with self._lock:
+            self._disk_usage = count, total
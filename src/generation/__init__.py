@@ -8,6 +8,7 @@ This module provides:
 """
 
 from .game_asset_generator import (
+    AssetDiskCache,
     GameAssetGenerator,
     GeneratedAssetSet,
 )
@@ -22,6 +23,7 @@ from .sound_generator import (
 )
 
 __all__ = [
+    "AssetDiskCache",
     "GameAssetGenerator",
     "GeneratedAssetSet",
     "DynamicGameGenerator",
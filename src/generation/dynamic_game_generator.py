@@ -180,10 +180,19 @@ For SHOOTER:
         self,
         api_key: Optional[str] = None,
         model: str = "claude-sonnet-4-20250514",
+        client=None,
     ):
-        """Initialize the generator."""
-        import anthropic
-        self.client = anthropic.Anthropic(api_key=api_key)
+        """Initialize the generator.
+
+        Args:
+            api_key: Anthropic API key. If None, uses ANTHROPIC_API_KEY env var.
+            model: Claude model to use for generation.
+            client: Existing anthropic.Anthropic client to share. Created if None.
+        """
+        if client is None:
+            import anthropic
+            client = anthropic.Anthropic(api_key=api_key)
+        self.client = client
         self.model = model
 
     def generate_game(
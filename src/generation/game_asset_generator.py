@@ -5,19 +5,93 @@ This module takes game analysis results and generates assets
 tailored to the specific game's visual style and template requirements.
 """
 
-import base64
-from dataclasses import dataclass, field
+import asyncio
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from base64 import b64decode
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from io import BytesIO
 from pathlib import Path
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
 
-import httpx
-from PIL import Image
+try:
+    # Optional SIMD-accelerated base64 (pip install pybase64)
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    from base64 import b64encode as _b64encode
+
+try:
+    # Optional Rust JSON codec for disk cache entries (pip install orjson)
+    import orjson
+
+    _json_dumps: Callable[[Any], bytes] = orjson.dumps
+    _json_loads: Callable[..., Any] = orjson.loads
+except ImportError:
+    def _stdlib_json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _json_dumps = _stdlib_json_dumps
+    _json_loads = json.loads
+
+try:
+    # Optional libvips binding for faster resize/encode (pip install pyvips)
+    import pyvips
+except (ImportError, OSError):
+    pyvips = None
 
-from src.layer_client import LayerClientSync, GeneratedImage, LayerAPIError
 from src.analysis.game_analyzer import GameAnalysis, AssetNeed, VisualStyle
 from src.templates.registry import MechanicType, TEMPLATE_REGISTRY, AssetRequirement
 
+if TYPE_CHECKING:
+    # httpx, Pillow, the Layer client and settings are imported where used, so
+    # importing this module (e.g. for GeneratedAssetSet) stays cheap
+    import httpx
+
+    from src.layer_client import LayerClientSync
+
+
+# Concurrent download settings. HTTP/2 lets all downloads share one TCP
+# connection; it is only enabled when the optional `h2` package is installed.
+MAX_CONCURRENT_DOWNLOADS = 16
+DOWNLOAD_TIMEOUT = 30.0
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Input chunk size for base64 encoding; a multiple of 3 so chunks never pad
+BASE64_CHUNK_SIZE = 3 * 16 * 1024
+
+
+def _encode_data_uri(mime_type: str, data: bytes) -> str:
+    """Base64-encode data into a data URI without a full-size intermediate copy.
+
+    The encoded output is written chunk by chunk into one preallocated
+    buffer, which is then decoded once into the final string.
+    """
+    prefix = f"data:{mime_type};base64,".encode("ascii")
+    buffer = bytearray(len(prefix) + 4 * ((len(data) + 2) // 3))
+    buffer[: len(prefix)] = prefix
+
+    offset = len(prefix)
+    view = memoryview(data)
+    for start in range(0, len(data), BASE64_CHUNK_SIZE):
+        encoded = _b64encode(view[start : start + BASE64_CHUNK_SIZE])
+        buffer[offset : offset + len(encoded)] = encoded
+        offset += len(encoded)
+
+    return buffer.decode("ascii")
+
+
+def _resize_dimensions(width: int, height: int, max_dimension: int) -> Optional[tuple[int, int]]:
+    """Target size that fits within max_dimension, or None if no resize is needed."""
+    longest = max(width, height)
+    if longest <= max_dimension:
+        return None
+    ratio = max_dimension / longest
+    return int(width * ratio), int(height * ratio)
+
 
 @dataclass
 class GeneratedAsset:
@@ -55,11 +129,11 @@ class GeneratedAssetSet:
 
     def get_asset_manifest(self) -> dict[str, str]:
         """Get manifest of asset keys to base64 data URIs."""
-        manifest = {}
-        for key, asset in self.assets.items():
-            if asset.is_valid and asset.base64_data:
-                manifest[key] = asset.base64_data
-        return manifest
+        return {
+            key: asset.base64_data
+            for key, asset in self.assets.items()
+            if asset.is_valid and asset.base64_data
+        }
 
     @property
     def all_valid(self) -> bool:
@@ -72,25 +146,171 @@ class GeneratedAssetSet:
         return sum(1 for a in self.assets.values() if a.is_valid)
 
 
+class AssetDiskCache:
+    """On-disk cache of optimized assets keyed by source URL and settings.
+
+    Each entry is a small JSON file holding the data URI and dimensions, so a
+    hit skips the download, Pillow processing and base64 encoding entirely.
+    Entries are written atomically and evicted least-recently-used once the
+    directory grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        # Running size of the directory, so evict() only scans it when needed
+        self._size_estimate: Optional[int] = None
+
+    @classmethod
+    def from_settings(cls) -> Optional["AssetDiskCache"]:
+        """Create the cache configured in settings, or None if disabled."""
+        from src.utils.helpers import get_settings
+
+        settings = get_settings()
+        if not settings.asset_cache_dir:
+            return None
+        return cls(Path(settings.asset_cache_dir), settings.asset_cache_max_mb * 1024 * 1024)
+
+    def _path(self, url: str, max_dimension: int, quality: int) -> Path:
+        digest = hashlib.sha256(f"{url}|{max_dimension}|{quality}".encode()).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def get(
+        self, url: str, max_dimension: int, quality: int
+    ) -> Optional[tuple[str, int, int]]:
+        """Return (data_uri, width, height) for a cached asset, or None."""
+        path = self._path(url, max_dimension, quality)
+        try:
+            entry = _json_loads(path.read_bytes())
+            os.utime(path)  # Refresh recency for LRU eviction
+            return entry["data_uri"], entry["width"], entry["height"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(
+        self,
+        url: str,
+        max_dimension: int,
+        quality: int,
+        data_uri: str,
+        width: int,
+        height: int,
+    ) -> None:
+        """Store an optimized asset; failures to write are ignored."""
+        path = self._path(url, max_dimension, quality)
+        payload = _json_dumps({"data_uri": data_uri, "width": width, "height": height})
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        if self._size_estimate is not None:
+            self._size_estimate += len(payload)
+
+    def evict(self) -> None:
+        """Delete least-recently-used entries until the cache fits max_bytes.
+
+        The directory is only scanned on first use or once the running size
+        estimate from put() passes max_bytes.
+        """
+        if self._size_estimate is not None and self._size_estimate <= self.max_bytes:
+            return
+        try:
+            entries = [(p, p.stat()) for p in self.cache_dir.glob("*.json")]
+        except OSError:
+            return
+        total = sum(st.st_size for _, st in entries)
+        for path, st in sorted(entries, key=lambda e: e[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= st.st_size
+            except OSError:
+                pass
+        self._size_estimate = total
+
+
 class GameAssetGenerator:
     """Generates game-specific assets using Layer.ai."""
 
     MAX_IMAGE_DIMENSION = 512
     JPEG_QUALITY = 85
+    MAX_PROCESSING_WORKERS = 8  # Pillow releases the GIL while resizing/encoding
+    # PNGs are first encoded at the default level; exhaustive PNG optimization
+    # costs ~4x the time for ~1% savings, so it only runs when the embedded
+    # assets exceed this budget (the smallest network limit, 2MB).
+    OPTIMIZE_BUDGET_BYTES = 2 * 1024 * 1024
 
     def __init__(
         self,
-        layer_client: Optional[LayerClientSync] = None,
+        layer_client: Optional["LayerClientSync"] = None,
         max_dimension: int = 512,
+        cache: Optional[AssetDiskCache] = None,
     ):
         """Initialize the asset generator.
 
         Args:
             layer_client: Layer.ai client. Created if not provided.
             max_dimension: Max image dimension for optimization.
+            cache: Optional disk cache of optimized assets.
         """
-        self.client = layer_client or LayerClientSync()
+        if layer_client is None:
+            from src.layer_client import LayerClientSync
+
+            layer_client = LayerClientSync()
+        self.client = layer_client
         self.max_dimension = max_dimension
+        self.cache = cache
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http: Optional["httpx.AsyncClient"] = None
+
+    def __enter__(self) -> "GameAssetGenerator":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __del__(self):
+        """Cleanup on garbage collection."""
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Get or create a persistent event loop for downloads."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
+    def _ensure_http(self) -> "httpx.AsyncClient":
+        """Get or create the pooled download client shared across batches."""
+        if self._http is None:
+            import httpx
+
+            self._http = httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                timeout=DOWNLOAD_TIMEOUT,
+                follow_redirects=True,
+            )
+        return self._http
+
+    def close(self) -> None:
+        """Close the download client and its event loop."""
+        if self._http is not None:
+            try:
+                self._ensure_loop().run_until_complete(self._http.aclose())
+            except Exception:
+                pass
+            self._http = None
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.close()
+            self._loop = None
 
     def generate_for_game(
         self,
@@ -128,33 +348,122 @@ class GameAssetGenerator:
             style_id=style_id,
         )
 
-        # Generate each asset
-        total = len(asset_requirements)
-        for i, (key, prompt) in enumerate(asset_requirements.items()):
+        # Generate all assets with Layer.ai concurrently, collecting image URLs
+        assets: dict[str, GeneratedAsset] = {}
+        pending: dict[str, tuple[str, str, float]] = {}
+        keys = list(asset_requirements)
+        total = len(keys)
+        completed = 0
+
+        def on_complete(index: int) -> None:
+            nonlocal completed
+            completed += 1
             if progress_callback:
-                progress_callback(i + 1, total, key)
+                progress_callback(completed, total, keys[index])
 
-            try:
-                asset = self._generate_asset(key, prompt, style_id)
-                result.assets[key] = asset
-                result.total_generation_time += asset.generation_time
-            except Exception as e:
-                # Create error asset
-                result.assets[key] = GeneratedAsset(
-                    key=key,
-                    prompt=prompt,
-                    image_url=None,
-                    image_data=None,
-                    base64_data=None,
-                    generation_time=0,
-                    error=str(e),
+        images = self.client.generate_many_with_polling(
+            list(asset_requirements.values()), style_id, on_complete
+        )
+
+        for (key, prompt), image in zip(asset_requirements.items(), images):
+            if isinstance(image, Exception):
+                assets[key] = self._error_asset(key, prompt, None, 0, str(image))
+                continue
+
+            generation_time = image.duration_seconds
+            result.total_generation_time += generation_time
+            if not image.image_url:
+                assets[key] = self._error_asset(
+                    key,
+                    prompt,
+                    None,
+                    generation_time,
+                    image.error_message or "No image URL returned",
                 )
+                continue
 
+            cached = self._cached_asset(key, prompt, image.image_url, generation_time)
+            if cached is not None:
+                assets[key] = cached
+                continue
+            pending[key] = (prompt, image.image_url, generation_time)
+
+        # Download and optimize all generated images concurrently
+        if pending:
+            built = self._ensure_loop().run_until_complete(self._download_assets(pending))
+            for asset in built:
+                assets[asset.key] = asset
+            for asset in self._fit_budget(list(assets.values())):
+                assets[asset.key] = asset
+            for key in (asset.key for asset in built):
+                asset = assets[key]  # As recompressed by _fit_budget, if it was
+                if (
+                    self.cache is not None
+                    and asset.is_valid
+                    and asset.image_url is not None
+                    and asset.base64_data is not None
+                ):
+                    self.cache.put(
+                        asset.image_url,
+                        self.max_dimension,
+                        self.JPEG_QUALITY,
+                        asset.base64_data,
+                        asset.width,
+                        asset.height,
+                    )
+            if self.cache is not None:
+                self.cache.evict()
+
+        # Preserve template requirement order in the result
+        result.assets = {key: assets[key] for key in asset_requirements}
         return result
 
+    async def _download_assets(
+        self,
+        pending: dict[str, tuple[str, str, float]],
+    ) -> list[GeneratedAsset]:
+        """Download images over the pooled client and optimize each on arrival.
+
+        Each download is handed to a worker thread as soon as it completes,
+        so Pillow processing overlaps the remaining downloads.
+
+        Args:
+            pending: Mapping of asset key -> (prompt, image_url, generation_time)
+        """
+        loop = asyncio.get_running_loop()
+        client = self._ensure_http()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+        workers = min(self.MAX_PROCESSING_WORKERS, len(pending))
+        # Optimized output keyed by digest of the downloaded bytes, so an
+        # image shared by several keys in this batch is only optimized once
+        prepared: dict[bytes, tuple[bytes, int, int, str]] = {}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+
+            async def fetch_and_build(
+                key: str, prompt: str, url: str, generation_time: float
+            ) -> GeneratedAsset:
+                data: bytes | BaseException
+                try:
+                    async with semaphore:
+                        response = await client.get(url)
+                        response.raise_for_status()
+                    data = response.content
+                except Exception as e:
+                    data = e
+                return await loop.run_in_executor(
+                    executor,
+                    self._build_asset,
+                    key, prompt, url, generation_time, data, prepared,
+                )
+
+            return await asyncio.gather(
+                *(fetch_and_build(key, *job) for key, job in pending.items())
+            )
+
     def _merge_requirements(
         self,
-        template_reqs: list[AssetRequirement],
+        template_reqs: Sequence[AssetRequirement],
         game_needs: list[AssetNeed],
         visual_style: VisualStyle,
     ) -> dict[str, str]:
@@ -191,45 +500,61 @@ class GameAssetGenerator:
 
         return result
 
-    def _generate_asset(
+    def _cached_asset(
         self,
         key: str,
         prompt: str,
-        style_id: str,
-    ) -> GeneratedAsset:
-        """Generate a single asset."""
-        import time
-
-        start_time = time.time()
-
-        # Generate with Layer.ai
-        result: GeneratedImage = self.client.generate_with_polling(
+        image_url: str,
+        generation_time: float,
+    ) -> Optional[GeneratedAsset]:
+        """Build an asset from the disk cache, if this URL was processed before."""
+        if self.cache is None:
+            return None
+        entry = self.cache.get(image_url, self.max_dimension, self.JPEG_QUALITY)
+        if entry is None:
+            return None
+
+        data_uri, width, height = entry
+        return GeneratedAsset(
+            key=key,
             prompt=prompt,
-            style_id=style_id,
+            image_url=image_url,
+            image_data=b64decode(data_uri.partition(",")[2]),
+            base64_data=data_uri,
+            generation_time=generation_time,
+            width=width,
+            height=height,
         )
 
-        generation_time = time.time() - start_time
-
-        if not result.image_url:
-            return GeneratedAsset(
-                key=key,
-                prompt=prompt,
-                image_url=None,
-                image_data=None,
-                base64_data=None,
-                generation_time=generation_time,
-                error=result.error_message or "No image URL returned",
-            )
+    def _build_asset(
+        self,
+        key: str,
+        prompt: str,
+        image_url: str,
+        generation_time: float,
+        data: bytes | BaseException,
+        prepared: dict[bytes, tuple[bytes, int, int, str]],
+    ) -> GeneratedAsset:
+        """Optimize downloaded image bytes into an embeddable asset.
 
-        # Download and optimize image
+        prepared holds the optimized output of this batch by content digest
+        and is filled in here.
+        """
         try:
-            image_data, width, height = self._download_and_optimize(result.image_url)
-            base64_data = self._to_data_uri(image_data)
+            if isinstance(data, BaseException):
+                raise data
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            entry = prepared.get(digest)
+            if entry is None:
+                image_data, width, height = self._optimize(data)
+                entry = (image_data, width, height, self._to_data_uri(image_data))
+                prepared[digest] = entry
+            image_data, width, height, base64_data = entry
 
             return GeneratedAsset(
                 key=key,
                 prompt=prompt,
-                image_url=result.image_url,
+                image_url=image_url,
                 image_data=image_data,
                 base64_data=base64_data,
                 generation_time=generation_time,
@@ -237,28 +562,47 @@ class GameAssetGenerator:
                 height=height,
             )
         except Exception as e:
-            return GeneratedAsset(
-                key=key,
-                prompt=prompt,
-                image_url=result.image_url,
-                image_data=None,
-                base64_data=None,
-                generation_time=generation_time,
-                error=f"Download/optimize failed: {str(e)}",
+            return self._error_asset(
+                key,
+                prompt,
+                image_url,
+                generation_time,
+                f"Download/optimize failed: {str(e)}",
             )
 
-    def _download_and_optimize(
+    def _error_asset(
         self,
-        url: str,
-    ) -> tuple[bytes, int, int]:
-        """Download image and optimize for playable ad size limits."""
-        # Download
-        response = httpx.get(url, timeout=30.0)
-        response.raise_for_status()
-
-        # Load with Pillow
-        with BytesIO(response.content) as input_buffer:
+        key: str,
+        prompt: str,
+        image_url: Optional[str],
+        generation_time: float,
+        error: str,
+    ) -> GeneratedAsset:
+        """Create a placeholder asset recording a failure."""
+        return GeneratedAsset(
+            key=key,
+            prompt=prompt,
+            image_url=image_url,
+            image_data=None,
+            base64_data=None,
+            generation_time=generation_time,
+            error=error,
+        )
+
+    def _optimize(self, raw: bytes) -> tuple[bytes, int, int]:
+        """Optimize downloaded image bytes for playable ad size limits."""
+        if pyvips is not None:
+            return self._optimize_vips(raw)
+
+        from PIL import Image
+
+        # Load with Pillow; the header is parsed lazily, so the target size
+        # is known before decoding and JPEGs can decode at a reduced scale
+        with BytesIO(raw) as input_buffer:
             img = Image.open(input_buffer)
+            new_size = _resize_dimensions(*img.size, self.max_dimension)
+            if new_size is not None and img.format == "JPEG":
+                img.draft("RGB", new_size)
             img.load()  # Force load before closing buffer
 
         # Convert to RGBA if needed (for transparency)
@@ -266,24 +610,84 @@ class GameAssetGenerator:
             img = img.convert("RGBA")
 
         # Resize if too large
-        width, height = img.size
-        if max(width, height) > self.max_dimension:
-            ratio = self.max_dimension / max(width, height)
-            new_size = (int(width * ratio), int(height * ratio))
+        if new_size is not None and img.size != new_size:
             img = img.resize(new_size, Image.Resampling.LANCZOS)
-            width, height = img.size
+        width, height = img.size
 
         # Save optimized
         output_buffer = BytesIO()
         try:
             if img.mode == "RGBA":
-                img.save(output_buffer, format="PNG", optimize=True)
+                img.save(output_buffer, format="PNG")
             else:
                 img.save(output_buffer, format="JPEG", quality=self.JPEG_QUALITY, optimize=True)
             return output_buffer.getvalue(), width, height
         finally:
             output_buffer.close()
 
+    def _optimize_vips(self, raw: bytes) -> tuple[bytes, int, int]:
+        """Optimize image bytes with libvips, mirroring the Pillow path.
+
+        Images with an alpha channel (or not plain RGB) are kept as PNG;
+        RGB images are re-encoded as JPEG.
+        """
+        # thumbnail_buffer shrinks JPEGs on load (DCT scaling) before the
+        # final Lanczos reduce, like Pillow's draft() in _optimize
+        img = pyvips.Image.thumbnail_buffer(
+            raw,
+            self.max_dimension,
+            height=self.max_dimension,
+            size="down",
+            no_rotate=True,
+        )
+
+        if img.bands == 3:
+            data = img.write_to_buffer(f".jpg[Q={self.JPEG_QUALITY},optimize_coding,strip]")
+        else:
+            data = img.write_to_buffer(".png[compression=6,strip]")
+        return data, img.width, img.height
+
+    def _fit_budget(self, assets: list[GeneratedAsset]) -> list[GeneratedAsset]:
+        """Recompress the largest PNG assets until the total fits the budget.
+
+        PNG recompression is lossless, so the decoded pixels are unchanged.
+        Returns the assets with recompressed ones replaced by new objects;
+        the assets passed in are left as they are.
+        """
+        fitted = list(assets)
+        total = sum(len(a.base64_data) for a in fitted if a.is_valid and a.base64_data)
+        if total <= self.OPTIMIZE_BUDGET_BYTES:
+            return fitted
+
+        from PIL import Image
+
+        pngs = [
+            (index, asset.image_data, asset.base64_data)
+            for index, asset in enumerate(fitted)
+            if asset.is_valid
+            and asset.image_data is not None
+            and asset.base64_data is not None
+            and asset.base64_data.startswith("data:image/png")
+        ]
+        for index, image_data, base64_data in sorted(
+            pngs, key=lambda png: len(png[2]), reverse=True
+        ):
+            with BytesIO(image_data) as input_buffer:
+                img = Image.open(input_buffer)
+                img.load()
+            with BytesIO() as output_buffer:
+                img.save(output_buffer, format="PNG", optimize=True)
+                optimized = output_buffer.getvalue()
+            if len(optimized) < len(image_data):
+                optimized_uri = self._to_data_uri(optimized)
+                total -= len(base64_data) - len(optimized_uri)
+                fitted[index] = replace(
+                    fitted[index], image_data=optimized, base64_data=optimized_uri
+                )
+            if total <= self.OPTIMIZE_BUDGET_BYTES:
+                break
+        return fitted
+
     def _to_data_uri(self, image_data: bytes) -> str:
         """Convert image bytes to data URI."""
         # Detect format from magic bytes
@@ -294,5 +698,4 @@ class GameAssetGenerator:
         else:
             mime_type = "image/png"  # Default
 
-        b64 = base64.standard_b64encode(image_data).decode("utf-8")
-        return f"data:{mime_type};base64,{b64}"
+        return _encode_data_uri(mime_type, image_data)
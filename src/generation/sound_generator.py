@@ -13,7 +13,10 @@ and keep file sizes small.
 import base64
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import httpx  # Imported where used, so bundled sounds never load it
 
 
 class SoundType(str, Enum):
@@ -231,6 +234,27 @@ class PixabaySounds:
             api_key: Pixabay API key (free to obtain)
         """
         self.api_key = api_key
+        self._http: Optional["httpx.Client"] = None
+
+    def __enter__(self) -> "PixabaySounds":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _ensure_http(self) -> "httpx.Client":
+        """Get or create the pooled client, so repeat searches reuse the connection."""
+        if self._http is None:
+            import httpx
+
+            self._http = httpx.Client(timeout=10)
+        return self._http
+
+    def close(self) -> None:
+        """Close the HTTP client."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
 
     def search_sounds(
         self,
@@ -251,8 +275,6 @@ class PixabaySounds:
         if not self.api_key:
             return []
 
-        import httpx
-
         params = {
             "key": self.api_key,
             "q": query,
@@ -261,7 +283,7 @@ class PixabaySounds:
         }
 
         try:
-            response = httpx.get(self.SEARCH_URL, params=params, timeout=10)
+            response = self._ensure_http().get(self.SEARCH_URL, params=params)
             response.raise_for_status()
             data = response.json()
             return data.get("hits", [])
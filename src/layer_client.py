@@ -11,7 +11,7 @@ import asyncio
 import time
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import httpx
 import structlog
@@ -27,6 +27,9 @@ from src.utils.helpers import get_settings
 
 logger = structlog.get_logger()
 
+# Max Layer.ai generations in flight at once when generating a batch
+MAX_CONCURRENT_GENERATIONS = 4
+
 
 # =============================================================================
 # Enums and Data Classes
@@ -41,7 +44,7 @@ class GenerationStatus(str, Enum):
     FAILED = "FAILED"
 
 
-@dataclass
+@dataclass(slots=True)
 class GeneratedImage:
     """Result of an image generation operation."""
     task_id: str
@@ -53,7 +56,7 @@ class GeneratedImage:
     prompt: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkspaceInfo:
     """Workspace information including credits."""
     workspace_id: str
@@ -67,7 +70,7 @@ class WorkspaceInfo:
         return self.credits_available >= settings.min_credits_required
 
 
-@dataclass
+@dataclass(slots=True)
 class StyleConfig:
     """Configuration for consistent style generation."""
     name: str
@@ -89,7 +92,7 @@ class StyleConfig:
         return ""
 
 
-@dataclass
+@dataclass(slots=True)
 class StyleRecipe:
     """
     Style Recipe extracted from competitor analysis.
@@ -391,6 +394,10 @@ class LayerClient:
             result = await client.generate_image("fantasy sword, game asset")
     """
 
+    # Starting estimate of a generation's duration (seconds), kept low
+    # because the first poll wait can only overshoot short jobs
+    INITIAL_GENERATION_ESTIMATE = 8.0
+
     def __init__(
         self,
         api_url: Optional[str] = None,
@@ -398,14 +405,17 @@ class LayerClient:
         workspace_id: Optional[str] = None,
         timeout: Optional[float] = None,
     ):
-        settings = get_settings()
-        self.api_url = api_url or settings.layer_api_url
-        self.api_key = api_key or settings.layer_api_key
-        self.workspace_id = workspace_id or settings.layer_workspace_id
+        self._settings = get_settings()
+        self.api_url = api_url or self._settings.layer_api_url
+        self.api_key = api_key or self._settings.layer_api_key
+        self.workspace_id = workspace_id or self._settings.layer_workspace_id
         self.timeout = timeout or 60.0  # Default 60s, but can be overridden
 
         self._client: Optional[httpx.AsyncClient] = None
         self._logger = logger.bind(component="LayerClient")
+        # Running average of this client's generation durations, so later
+        # polls can skip ahead to the expected finish time
+        self._generation_duration_ewma = self.INITIAL_GENERATION_ESTIMATE
 
     async def __aenter__(self) -> "LayerClient":
         # Layer.ai uses Bearer token authentication with Personal Access Tokens
@@ -539,10 +549,9 @@ class LayerClient:
         """Check credits and raise if insufficient."""
         info = await self.get_workspace_info()
         if not info.has_credits:
-            settings = get_settings()
             raise InsufficientCreditsError(
                 f"Insufficient credits: {info.credits_available} available, "
-                f"{settings.min_credits_required} required"
+                f"{self._settings.min_credits_required} required"
             )
         return info
 
@@ -725,15 +734,16 @@ class LayerClient:
         poll_interval: float = 2.0,
     ) -> GeneratedImage:
         """Poll generation until complete."""
-        settings = get_settings()
-        timeout = timeout_seconds or settings.forge_poll_timeout
-        start_time = time.time()
+        timeout = timeout_seconds or self._settings.forge_poll_timeout
+        start_time = time.monotonic()
+        deadline = start_time + timeout
         current_interval = poll_interval
+        first_check = True
 
         self._logger.info("Polling generation", task_id=task_id, timeout=timeout)
 
         while True:
-            elapsed = time.time() - start_time
+            elapsed = time.monotonic() - start_time
             if elapsed > timeout:
                 raise GenerationTimeoutError(
                     f"Generation {task_id} timed out after {timeout}s"
@@ -743,6 +753,9 @@ class LayerClient:
 
             if result.status == GenerationStatus.COMPLETED:
                 result.duration_seconds = elapsed
+                self._generation_duration_ewma = (
+                    0.3 * elapsed + 0.7 * self._generation_duration_ewma
+                )
                 self._logger.info(
                     "Generation completed",
                     task_id=task_id,
@@ -761,8 +774,15 @@ class LayerClient:
                 elapsed=f"{elapsed:.1f}s",
             )
 
-            await asyncio.sleep(current_interval)
-            current_interval = min(current_interval * 1.5, 10.0)
+            if first_check:
+                # Jump to just before the expected completion, then back off
+                first_check = False
+                wait = max(poll_interval, self._generation_duration_ewma * 0.8 - elapsed)
+            else:
+                wait = current_interval
+                current_interval = min(current_interval * 1.5, 10.0)
+            # Never sleep past the deadline; the last check happens there
+            await asyncio.sleep(max(0.0, min(wait, deadline - time.monotonic())))
 
     async def generate_with_polling(
         self,
@@ -962,6 +982,7 @@ class LayerClientSync:
         self._api_key = api_key
         self._workspace_id = workspace_id
         self._timeout = timeout
+        self._settings = get_settings()
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._client: Optional[LayerClient] = None
 
@@ -1031,6 +1052,48 @@ class LayerClientSync:
             client.generate_with_polling(prompt, style_id, style, reference_image_id)
         )
 
+    def generate_many_with_polling(
+        self,
+        prompts: list[str],
+        style_id: str,
+        on_complete: Optional[Callable[[int], None]] = None,
+    ) -> list[GeneratedImage | Exception]:
+        """Generate several images concurrently and wait for all of them.
+
+        Args:
+            prompts: Prompts to generate, one image each
+            style_id: Layer.ai style ID used for every prompt
+            on_complete: Optional callback(index) as each generation finishes
+
+        Returns:
+            One GeneratedImage (with duration_seconds set) or the raised
+            exception per prompt, in prompt order
+        """
+        client = self._ensure_client()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+
+        async def generate(index: int, prompt: str) -> GeneratedImage | Exception:
+            async with semaphore:
+                start = time.monotonic()
+                result: GeneratedImage | Exception
+                try:
+                    image: GeneratedImage = await client.generate_with_polling(prompt, style_id)
+                    image.duration_seconds = time.monotonic() - start
+                    result = image
+                except Exception as e:
+                    result = e
+            if on_complete:
+                on_complete(index)
+            return result
+
+        async def generate_all() -> list[GeneratedImage | Exception]:
+            return await asyncio.gather(
+                *(generate(i, prompt) for i, prompt in enumerate(prompts))
+            )
+
+        results: list[GeneratedImage | Exception] = self._run(generate_all())
+        return results
+
     def download_image(self, image_url: str) -> bytes:
         """Download image bytes."""
         client = self._ensure_client()
@@ -1061,9 +1124,8 @@ class LayerClientSync:
 
     def get_style_dashboard_url(self, style_id: str) -> str:
         """Get dashboard URL for a style."""
-        settings = get_settings()
-        api_url = self._api_url or settings.layer_api_url
-        workspace_id = self._workspace_id or settings.layer_workspace_id
+        api_url = self._api_url or self._settings.layer_api_url
+        workspace_id = self._workspace_id or self._settings.layer_workspace_id
         base_url = api_url.replace("/v1/graphql", "").replace("/graphql", "").replace("api.", "")
         return f"{base_url}/workspace/{workspace_id}/styles/{style_id}"
 
@@ -23,18 +23,27 @@ Usage:
     result.save_zip("output/playable.zip")
 """
 
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Callable
-import zipfile
+from typing import BinaryIO, Optional, Callable
 
 from src.analysis import GameAnalyzerSync, GameAnalysis
-from src.generation import GameAssetGenerator, GeneratedAssetSet, DynamicGameGenerator
-from src.assembly import PlayableBuilder, PlayableConfig, PlayableResult
+from src.cache import ResultCache, assets_key
+from src.generation import (
+    AssetDiskCache, GameAssetGenerator, GeneratedAssetSet, DynamicGameGenerator,
+)
+from src.assembly import (
+    PlayableBuilder, PlayableConfig, PlayableResult,
+    utf8_size, write_html_file, write_html_zip,
+)
 from src.templates import MechanicType, TEMPLATE_REGISTRY
 
 
-@dataclass
+@dataclass(slots=True)
 class FactoryConfig:
     """Configuration for the playable factory."""
 
@@ -60,7 +69,7 @@ class FactoryConfig:
     style_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayableOutput:
     """Final output from the factory."""
 
@@ -94,16 +103,13 @@ class PlayableOutput:
 
     def save(self, path: str | Path) -> None:
         """Save as HTML file."""
-        path = Path(path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(self.html)
+        write_html_file(self.html, Path(path))
 
-    def save_zip(self, path: str | Path) -> None:
-        """Save as ZIP file (for Google Ads)."""
-        path = Path(path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr("index.html", self.html)
+    def save_zip(self, path: str | Path | BinaryIO) -> None:
+        """Save as ZIP file (for Google Ads), to a path or binary file object."""
+        if isinstance(path, str):
+            path = Path(path)
+        write_html_zip(self.html, path)
 
 
 class PlayableFactory:
@@ -133,20 +139,38 @@ class PlayableFactory:
             print(f"Created {result.mechanic_type.value} playable: {result.file_size_formatted}")
     """
 
+    MAX_WORKERS = 8  # Concurrent pipelines for create_from_screenshots_async
+
     def __init__(
         self,
         anthropic_api_key: Optional[str] = None,
         layer_api_key: Optional[str] = None,
+        cache: Optional[ResultCache] = None,
     ):
         """Initialize the factory.
 
         Args:
             anthropic_api_key: Anthropic API key (uses env var if not provided)
             layer_api_key: Layer.ai API key (uses env var if not provided)
+            cache: Cache for analyses and asset sets (from settings if not provided)
         """
-        self._analyzer = GameAnalyzerSync(api_key=anthropic_api_key)
+        self._cache = cache if cache is not None else ResultCache.from_settings()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._layer_api_key = layer_api_key
+        # One asset generator (and its HTTP pools) per thread, reused across
+        # calls; each owns an event loop so it can't be shared between threads
+        self._local = threading.local()
+        self._asset_generators: list[GameAssetGenerator] = []
+        self._asset_generators_lock = threading.Lock()
+        # One Anthropic client (and connection pool) for analysis and dynamic
+        # generation, created on first use so demo-only use never imports the
+        # SDK; it is thread-safe, so the async pool shares it
+        self._anthropic_api_key = anthropic_api_key
+        self._anthropic = None
+        self._analyzer: Optional[GameAnalyzerSync] = None
+        self._dynamic_generator: Optional[DynamicGameGenerator] = None
+        self._clients_lock = threading.Lock()
         self._builder = PlayableBuilder()
-        self._dynamic_generator = DynamicGameGenerator(api_key=anthropic_api_key)
 
     def create_from_screenshots(
         self,
@@ -183,40 +207,27 @@ class PlayableFactory:
 
         # Step 1: Analyze game
         progress("Analyzing game...", 1, 4)
-        analysis = self._analyzer.analyze_screenshots(screenshots, game_name_hint)
+        analysis = self._analyze(screenshots, game_name_hint)
 
         # Step 2: Generate assets
         progress("Generating assets...", 2, 4)
-        asset_generator = GameAssetGenerator()
-        assets = asset_generator.generate_for_game(
-            analysis=analysis,
-            style_id=style_id,
+        assets = self._generate_assets(
+            analysis,
+            style_id,
             progress_callback=lambda c, t, n: progress(f"Generating {n}...", c, t),
         )
 
         # Step 3: Build playable
         progress("Assembling playable...", 3, 4)
-        playable_config = PlayableConfig(
-            game_name=analysis.game_name,
-            title=analysis.game_name,
-            store_url=config.store_url,
-            store_url_ios=config.store_url_ios,
-            store_url_android=config.store_url_android,
-            width=config.width,
-            height=config.height,
-            background_color=config.background_color,
-            hook_text=config.hook_text or analysis.hook_suggestion,
-            cta_text=config.cta_text or analysis.cta_suggestion,
-            sound_enabled=config.sound_enabled,
-        )
+        playable_config = self._build_config(config, analysis)
 
         if config.use_dynamic_generation:
             # Use Claude to generate custom game code
-            generated = self._dynamic_generator.generate_game(analysis)
+            generated = self._get_dynamic_generator().generate_game(analysis)
             # TODO: Merge with assets
             result = PlayableResult(
                 html=generated.html,
-                file_size_bytes=len(generated.html.encode()),
+                file_size_bytes=utf8_size(generated.html),
                 mechanic_type=analysis.mechanic_type,
                 assets_embedded=0,
                 is_valid=True,
@@ -240,6 +251,66 @@ class PlayableFactory:
             assets=assets,
         )
 
+    async def create_from_screenshots_async(
+        self,
+        screenshots: list[bytes | str | Path],
+        style_id: str,
+        store_url: str = "",
+        config: Optional[FactoryConfig] = None,
+        game_name_hint: Optional[str] = None,
+        progress_callback: Optional[Callable[[str, int, int], None]] = None,
+    ) -> PlayableOutput:
+        """Async variant of create_from_screenshots for callers with an event loop.
+
+        The Anthropic and Layer.ai clients block, so the pipeline runs on
+        the factory's worker pool and the caller's loop stays responsive.
+        Several playables can be created concurrently with asyncio.gather.
+        progress_callback is invoked from the worker thread.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.MAX_WORKERS, thread_name_prefix="playable-factory"
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            functools.partial(
+                self.create_from_screenshots,
+                screenshots,
+                style_id,
+                store_url=store_url,
+                config=config,
+                game_name_hint=game_name_hint,
+                progress_callback=progress_callback,
+            ),
+        )
+
+    def close(self) -> None:
+        """Shut down the worker pool and close the API clients' connections.
+
+        Queued pipelines are cancelled and running ones finish first, since
+        they use the generators and clients closed here.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        with self._asset_generators_lock:
+            generators, self._asset_generators = self._asset_generators, []
+        for generator in generators:
+            generator.close()
+            generator.client.close()
+        self._local = threading.local()
+        with self._clients_lock:
+            client, self._anthropic = self._anthropic, None
+            self._analyzer = self._dynamic_generator = None
+        if client is not None:
+            client.close()
+
+    def __enter__(self) -> "PlayableFactory":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     def create_from_analysis(
         self,
         analysis: GameAnalysis,
@@ -270,24 +341,11 @@ class PlayableFactory:
 
         # Generate assets
         progress("Generating assets...", 1, 2)
-        asset_generator = GameAssetGenerator()
-        assets = asset_generator.generate_for_game(analysis, style_id)
+        assets = self._generate_assets(analysis, style_id)
 
         # Build playable
         progress("Assembling playable...", 2, 2)
-        playable_config = PlayableConfig(
-            game_name=analysis.game_name,
-            title=analysis.game_name,
-            store_url=config.store_url,
-            store_url_ios=config.store_url_ios,
-            store_url_android=config.store_url_android,
-            width=config.width,
-            height=config.height,
-            background_color=config.background_color,
-            hook_text=config.hook_text or analysis.hook_suggestion,
-            cta_text=config.cta_text or analysis.cta_suggestion,
-            sound_enabled=config.sound_enabled,
-        )
+        playable_config = self._build_config(config, analysis)
 
         result = self._builder.build(analysis, assets, playable_config)
 
@@ -303,6 +361,91 @@ class PlayableFactory:
             assets=assets,
         )
 
+    @staticmethod
+    def _build_config(config: FactoryConfig, analysis: GameAnalysis) -> PlayableConfig:
+        """Assembly config from factory settings, with text filled from the analysis."""
+        return PlayableConfig(
+            game_name=analysis.game_name,
+            title=analysis.game_name,
+            store_url=config.store_url,
+            store_url_ios=config.store_url_ios,
+            store_url_android=config.store_url_android,
+            width=config.width,
+            height=config.height,
+            background_color=config.background_color,
+            hook_text=config.hook_text or analysis.hook_suggestion,
+            cta_text=config.cta_text or analysis.cta_suggestion,
+            sound_enabled=config.sound_enabled,
+        )
+
+    def _analyze(
+        self,
+        screenshots: list[bytes | str | Path],
+        game_name_hint: Optional[str] = None,
+    ) -> GameAnalysis:
+        """Analyze screenshots; the analyzer caches responses in the factory's cache."""
+        return self._get_analyzer().analyze_screenshots(screenshots, game_name_hint)
+
+    def _generate_assets(
+        self,
+        analysis: GameAnalysis,
+        style_id: str,
+        progress_callback: Optional[Callable] = None,
+    ) -> GeneratedAssetSet:
+        """Generate assets, reusing a cached set for the same analysis and style.
+
+        Sets with failed assets are not cached so a re-run retries them.
+        """
+        key = assets_key(analysis, style_id)
+        assets = self._cache.get(key)
+        if assets is None:
+            assets = self._get_asset_generator().generate_for_game(
+                analysis=analysis,
+                style_id=style_id,
+                progress_callback=progress_callback,
+            )
+            if assets.all_valid:
+                self._cache.put(key, assets)
+        return assets
+
+    def _get_anthropic(self):
+        """Get the shared Anthropic client, creating it on first use."""
+        with self._clients_lock:
+            if self._anthropic is None:
+                import anthropic
+
+                self._anthropic = anthropic.Anthropic(api_key=self._anthropic_api_key)
+            return self._anthropic
+
+    def _get_analyzer(self) -> GameAnalyzerSync:
+        """Get the game analyzer, creating it on first use."""
+        if self._analyzer is None:
+            self._analyzer = GameAnalyzerSync(client=self._get_anthropic(), cache=self._cache)
+        return self._analyzer
+
+    def _get_dynamic_generator(self) -> DynamicGameGenerator:
+        """Get the dynamic game generator, creating it on first use."""
+        if self._dynamic_generator is None:
+            self._dynamic_generator = DynamicGameGenerator(client=self._get_anthropic())
+        return self._dynamic_generator
+
+    def _get_asset_generator(self) -> GameAssetGenerator:
+        """Get the calling thread's asset generator, creating it on first use."""
+        generator = getattr(self._local, "asset_generator", None)
+        if generator is None:
+            # Imported here: the Layer client pulls in httpx and pydantic
+            # settings, which demo-only use never needs
+            from src.layer_client import LayerClientSync
+
+            generator = GameAssetGenerator(
+                layer_client=LayerClientSync(api_key=self._layer_api_key),
+                cache=AssetDiskCache.from_settings(),
+            )
+            self._local.asset_generator = generator
+            with self._asset_generators_lock:
+                self._asset_generators.append(generator)
+        return generator
+
     def create_demo(
         self,
         mechanic_type: MechanicType = MechanicType.MATCH3,
@@ -380,6 +523,14 @@ class PlayableFactory:
         )
 
 
+def _config_from_options(store_url: str, options: dict) -> FactoryConfig:
+    """FactoryConfig from create_playable-style keyword options."""
+    return FactoryConfig(
+        store_url=store_url,
+        **{k: v for k, v in options.items() if hasattr(FactoryConfig, k)}
+    )
+
+
 # Convenience function for quick usage
 def create_playable(
     screenshots: list[bytes | str | Path],
@@ -398,13 +549,60 @@ def create_playable(
     Returns:
         PlayableOutput
     """
-    factory = PlayableFactory()
-    config = FactoryConfig(
-        store_url=store_url,
-        **{k: v for k, v in kwargs.items() if hasattr(FactoryConfig, k)}
-    )
-    return factory.create_from_screenshots(
-        screenshots=screenshots,
-        style_id=style_id,
-        config=config,
-    )
+    config = _config_from_options(store_url, kwargs)
+    with PlayableFactory() as factory:
+        return factory.create_from_screenshots(
+            screenshots=screenshots,
+            style_id=style_id,
+            config=config,
+        )
+
+
+async def create_playables_async(
+    jobs: list[dict],
+    max_concurrency: int = PlayableFactory.MAX_WORKERS,
+    factory: Optional[PlayableFactory] = None,
+) -> list[PlayableOutput]:
+    """Create several playables concurrently (e.g. A/B variants).
+
+    Each job holds create_playable's arguments: screenshots, style_id,
+    store_url and optional config options. One factory, and with it the
+    result cache and HTTP pools, is shared by all jobs.
+
+    Args:
+        jobs: Keyword arguments for each playable
+        max_concurrency: Max pipelines in flight (capped by the factory's pool)
+        factory: Factory to use; a temporary one is created and closed if None
+
+    Returns:
+        PlayableOutputs in job order
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    owned = factory is None
+    factory = factory or PlayableFactory()
+
+    async def run(job: dict) -> PlayableOutput:
+        options = dict(job)
+        screenshots = options.pop("screenshots")
+        style_id = options.pop("style_id")
+        store_url = options.pop("store_url", "")
+        async with semaphore:
+            return await factory.create_from_screenshots_async(
+                screenshots,
+                style_id,
+                config=_config_from_options(store_url, options),
+            )
+
+    try:
+        return await asyncio.gather(*(run(job) for job in jobs))
+    finally:
+        if owned:
+            factory.close()
+
+
+def create_playables(
+    jobs: list[dict],
+    max_concurrency: int = PlayableFactory.MAX_WORKERS,
+) -> list[PlayableOutput]:
+    """Blocking wrapper around create_playables_async for scripts."""
+    return asyncio.run(create_playables_async(jobs, max_concurrency))
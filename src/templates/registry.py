@@ -7,13 +7,14 @@ This module defines:
 - TEMPLATE_REGISTRY mapping mechanics to templates
 """
 
-import structlog
+import functools
+import re
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Optional
 
-logger = structlog.get_logger()
+_TEMPLATES_DIR = Path(__file__).parent
 
 
 class MechanicType(str, Enum):
@@ -30,27 +31,47 @@ class MechanicType(str, Enum):
     @classmethod
     def from_string(cls, value: str) -> "MechanicType":
         """Convert string to MechanicType, defaulting to UNKNOWN."""
-        value_lower = value.lower().strip()
-        for member in cls:
-            if member.value == value_lower:
-                return member
-        # Try partial matching
-        if "match" in value_lower or "3" in value_lower:
-            return cls.MATCH3
-        if "run" in value_lower or "endless" in value_lower:
-            return cls.RUNNER
-        if "tap" in value_lower or "click" in value_lower or "idle" in value_lower:
-            return cls.TAPPER
-        if "merge" in value_lower or "2048" in value_lower:
-            return cls.MERGER
-        if "puzzle" in value_lower or "tetris" in value_lower or "block" in value_lower:
-            return cls.PUZZLE
-        if "shoot" in value_lower or "angry" in value_lower or "aim" in value_lower:
-            return cls.SHOOTER
-        return cls.UNKNOWN
-
-
-@dataclass
+        return _mechanic_from_string(value)
+
+
+# Partial-match keywords for MechanicType.from_string, highest priority first
+_MECHANIC_KEYWORDS: tuple[tuple[MechanicType, tuple[str, ...]], ...] = (
+    (MechanicType.MATCH3, ("match", "3")),
+    (MechanicType.RUNNER, ("run", "endless")),
+    (MechanicType.TAPPER, ("tap", "click", "idle")),
+    (MechanicType.MERGER, ("merge", "2048")),
+    (MechanicType.PUZZLE, ("puzzle", "tetris", "block")),
+    (MechanicType.SHOOTER, ("shoot", "angry", "aim")),
+)
+_MECHANIC_BY_VALUE = {member.value: member for member in MechanicType}
+_KEYWORD_RANK = {
+    keyword: rank
+    for rank, (_, keywords) in enumerate(_MECHANIC_KEYWORDS)
+    for keyword in keywords
+}
+# Lookahead so overlapping keywords are all found in a single scan
+_KEYWORD_PATTERN = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in _KEYWORD_RANK) + "))"
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _mechanic_from_string(value: str) -> MechanicType:
+    value_lower = value.lower().strip()
+    member = _MECHANIC_BY_VALUE.get(value_lower)
+    if member is not None:
+        return member
+    # Try partial matching; the highest-priority keyword found wins
+    rank = min(
+        (_KEYWORD_RANK[m.group(1)] for m in _KEYWORD_PATTERN.finditer(value_lower)),
+        default=None,
+    )
+    if rank is None:
+        return MechanicType.UNKNOWN
+    return _MECHANIC_KEYWORDS[rank][0]
+
+
+@dataclass(slots=True, frozen=True)
 class AssetRequirement:
     """Definition of a required asset for a template."""
 
@@ -62,7 +83,7 @@ class AssetRequirement:
     max_size: int = 512  # Max dimension in pixels
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConfigParameter:
     """Definition of a configurable parameter for a template."""
 
@@ -74,7 +95,7 @@ class ConfigParameter:
     description: str = ""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TemplateInfo:
     """Complete information about a game template."""
 
@@ -82,18 +103,26 @@ class TemplateInfo:
     name: str
     description: str
     template_file: str  # Relative path from templates directory
-    required_assets: list[AssetRequirement]
-    config_parameters: list[ConfigParameter]
-    example_games: list[str] = field(default_factory=list)
+    required_assets: tuple[AssetRequirement, ...]
+    config_parameters: tuple[ConfigParameter, ...]
+    example_games: tuple[str, ...] = ()
+    # Derived once from the fields above; registry entries are immutable
+    template_path: Path = field(init=False, repr=False, compare=False)
+    asset_keys: tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "template_path", _TEMPLATES_DIR / self.template_file)
+        object.__setattr__(
+            self, "asset_keys", tuple(a.key for a in self.required_assets if a.required)
+        )
 
     def get_template_path(self) -> Path:
         """Get absolute path to template file."""
-        templates_dir = Path(__file__).parent
-        return templates_dir / self.template_file
+        return self.template_path
 
     def get_asset_keys(self) -> list[str]:
         """Get list of required asset keys."""
-        return [a.key for a in self.required_assets if a.required]
+        return list(self.asset_keys)
 
     def get_default_config(self) -> dict:
         """Get default configuration values."""
@@ -109,8 +138,8 @@ MATCH3_TEMPLATE = TemplateInfo(
     name="Match-3 Puzzle",
     description="Swap adjacent tiles to match 3 or more of the same type",
     template_file="match3/template.html",
-    example_games=["Candy Crush", "Bejeweled", "Gardenscapes", "Homescapes"],
-    required_assets=[
+    example_games=("Candy Crush", "Bejeweled", "Gardenscapes", "Homescapes"),
+    required_assets=(
         AssetRequirement(
             key="tile_1",
             description="First tile type (e.g., red gem, candy)",
@@ -137,8 +166,8 @@ MATCH3_TEMPLATE = TemplateInfo(
             default_prompt="colorful game background, fantasy, vibrant",
             transparency=False,
         ),
-    ],
-    config_parameters=[
+    ),
+    config_parameters=(
         ConfigParameter(
             key="GRID_WIDTH",
             type="int",
@@ -171,7 +200,7 @@ MATCH3_TEMPLATE = TemplateInfo(
             max_value=4,
             description="Minimum tiles needed for a match",
         ),
-    ],
+    ),
 )
 
 RUNNER_TEMPLATE = TemplateInfo(
@@ -179,8 +208,8 @@ RUNNER_TEMPLATE = TemplateInfo(
     name="Endless Runner",
     description="Run, jump, and dodge obstacles in lanes",
     template_file="runner/template.html",
-    example_games=["Subway Surfers", "Temple Run", "Sonic Dash", "Minion Rush"],
-    required_assets=[
+    example_games=("Subway Surfers", "Temple Run", "Sonic Dash", "Minion Rush"),
+    required_assets=(
         AssetRequirement(
             key="player",
             description="Main player character (running pose)",
@@ -202,8 +231,8 @@ RUNNER_TEMPLATE = TemplateInfo(
             default_prompt="endless runner game background, road or path, colorful",
             transparency=False,
         ),
-    ],
-    config_parameters=[
+    ),
+    config_parameters=(
         ConfigParameter(
             key="LANES",
             type="int",
@@ -228,7 +257,7 @@ RUNNER_TEMPLATE = TemplateInfo(
             max_value=600,
             description="Jump velocity",
         ),
-    ],
+    ),
 )
 
 TAPPER_TEMPLATE = TemplateInfo(
@@ -236,8 +265,8 @@ TAPPER_TEMPLATE = TemplateInfo(
     name="Tapper / Idle Clicker",
     description="Tap rapidly to accumulate points with multipliers",
     template_file="tapper/template.html",
-    example_games=["Cookie Clicker", "Idle Miner Tycoon", "Tap Titans", "AdVenture Capitalist"],
-    required_assets=[
+    example_games=("Cookie Clicker", "Idle Miner Tycoon", "Tap Titans", "AdVenture Capitalist"),
+    required_assets=(
         AssetRequirement(
             key="target",
             description="Main tappable element (cookie, character, button)",
@@ -255,8 +284,8 @@ TAPPER_TEMPLATE = TemplateInfo(
             default_prompt="idle game background, colorful, appealing",
             transparency=False,
         ),
-    ],
-    config_parameters=[
+    ),
+    config_parameters=(
         ConfigParameter(
             key="POINTS_PER_TAP",
             type="int",
@@ -273,7 +302,7 @@ TAPPER_TEMPLATE = TemplateInfo(
             max_value=50,
             description="Taps needed for bonus",
         ),
-    ],
+    ),
 )
 
 
@@ -292,7 +321,9 @@ def get_template(mechanic_type: MechanicType) -> Optional[TemplateInfo]:
     """Get template info for a mechanic type."""
     template = TEMPLATE_REGISTRY.get(mechanic_type)
     if template is None and mechanic_type != MechanicType.UNKNOWN:
-        logger.warning(
+        import structlog  # Imported lazily; only needed on this rare path
+
+        structlog.get_logger().warning(
             "No template for mechanic type, will fall back to tapper",
             mechanic_type=mechanic_type.value,
         )
@@ -313,6 +344,6 @@ def list_available_mechanics() -> list[MechanicType]:
 def get_mechanic_examples() -> dict[MechanicType, list[str]]:
     """Get example games for each mechanic type."""
     return {
-        mechanic: info.example_games
+        mechanic: list(info.example_games)
         for mechanic, info in TEMPLATE_REGISTRY.items()
     }
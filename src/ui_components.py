@@ -3,9 +3,56 @@ Reusable HTML UI components for the Layer.ai Playable Studio.
 
 All functions return HTML strings for use with st.markdown(html, unsafe_allow_html=True).
 Components use CSS variables defined in the main app.py design system.
+
+Streamlit reruns the whole script on every interaction, so components are
+memoized on their (hashable) arguments and repeat renders are a lookup.
 """
 
+import functools
+import re
+from dataclasses import dataclass
+from typing import Sequence
+
+# Cache size for memoized components
+_COMPONENT_CACHE_SIZE = 128
+
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
+def _minify(html: str) -> str:
+    """Collapse the source indentation of component HTML.
+
+    Whitespace runs, including those between tags, become a single space, as
+    the browser renders them; dropping them would join inline elements. Only
+    used on markup this module fully controls (no <pre> or white-space:pre
+    content).
+    """
+    return _WHITESPACE_RUN.sub(" ", html).strip()
+
+
+# Ad network playable size limits (MB), in display order.
+NETWORK_SIZE_LIMITS: tuple[tuple[str, int], ...] = (
+    ("Google Ads", 5),
+    ("Unity", 5),
+    ("IronSource", 5),
+    ("AppLovin", 5),
+    ("Facebook", 2),
+)
 
+# Same limits, smallest first, for short-circuiting size checks.
+_NETWORK_LIMITS_ASCENDING = sorted(NETWORK_SIZE_LIMITS, key=lambda item: item[1])
+
+
+def _size_compatible_networks(file_size_mb: float) -> set[str]:
+    """Names of networks whose size limit the file fits under."""
+    for i, (_, limit) in enumerate(_NETWORK_LIMITS_ASCENDING):
+        if file_size_mb <= limit:
+            # Limits only grow from here, so every remaining network fits too
+            return {name for name, _ in _NETWORK_LIMITS_ASCENDING[i:]}
+    return set()
+
+
+@functools.lru_cache(maxsize=_COMPONENT_CACHE_SIZE)
 def glass_card(
     content: str,
     title: str = "",
@@ -54,6 +101,13 @@ def glass_card(
     """
 
 
+# Progress dots for step_header
+_DOT_ACTIVE = '<span style="width:10px;height:10px;border-radius:50%;background:var(--accent);display:inline-block;margin:0 4px;"></span>'
+_DOT_DONE = '<span style="width:8px;height:8px;border-radius:50%;background:var(--color-success);display:inline-block;margin:0 4px;opacity:0.8;"></span>'
+_DOT_PENDING = '<span style="width:8px;height:8px;border-radius:50%;background:var(--glass-border);display:inline-block;margin:0 4px;"></span>'
+
+
+@functools.lru_cache(maxsize=_COMPONENT_CACHE_SIZE)
 def step_header(step_num: int, title: str, total_steps: int = 4) -> str:
     """Gradient number badge + progress dots + thin progress bar.
 
@@ -62,14 +116,10 @@ def step_header(step_num: int, title: str, total_steps: int = 4) -> str:
         title: Step title text.
         total_steps: Total number of steps.
     """
-    dots = ""
-    for i in range(1, total_steps + 1):
-        if i == step_num:
-            dots += '<span style="width:10px;height:10px;border-radius:50%;background:var(--accent);display:inline-block;margin:0 4px;"></span>'
-        elif i < step_num:
-            dots += '<span style="width:8px;height:8px;border-radius:50%;background:var(--color-success);display:inline-block;margin:0 4px;opacity:0.8;"></span>'
-        else:
-            dots += '<span style="width:8px;height:8px;border-radius:50%;background:var(--glass-border);display:inline-block;margin:0 4px;"></span>'
+    # Done dots, then the active one, then pending ones
+    done = min(max(step_num - 1, 0), total_steps)
+    active = 1 if 1 <= step_num <= total_steps else 0
+    dots = _DOT_DONE * done + _DOT_ACTIVE * active + _DOT_PENDING * (total_steps - done - active)
 
     pct = int((step_num / total_steps) * 100)
 
@@ -106,6 +156,26 @@ def step_header(step_num: int, title: str, total_steps: int = 4) -> str:
     """
 
 
+# (background, value color) for metric_card by status
+_METRIC_STYLE = {
+    "success": ("rgba(72,187,120,0.12)", "var(--color-success)"),
+    "warning": ("rgba(236,201,75,0.12)", "var(--color-warning)"),
+    "error": ("rgba(245,101,101,0.12)", "var(--color-error)"),
+    "default": ("var(--glass-bg)", "var(--text-primary)"),
+}
+_METRIC_STYLE_DEFAULT = _METRIC_STYLE["default"]
+
+
+@dataclass(frozen=True, slots=True)
+class MetricCard:
+    """Content of a metric card, independent of how it is rendered."""
+
+    label: str
+    value: str
+    icon: str = ""
+    status: str = "default"  # One of 'success', 'warning', 'error', 'default'
+
+
 def metric_card(
     label: str,
     value: str,
@@ -120,20 +190,14 @@ def metric_card(
         icon: Optional emoji/icon.
         status: One of 'success', 'warning', 'error', 'default'.
     """
-    bg_map = {
-        "success": "rgba(72,187,120,0.12)",
-        "warning": "rgba(236,201,75,0.12)",
-        "error": "rgba(245,101,101,0.12)",
-        "default": "var(--glass-bg)",
-    }
-    color_map = {
-        "success": "var(--color-success)",
-        "warning": "var(--color-warning)",
-        "error": "var(--color-error)",
-        "default": "var(--text-primary)",
-    }
-    bg = bg_map.get(status, bg_map["default"])
-    color = color_map.get(status, color_map["default"])
+    return render_metric_card(MetricCard(label, value, icon, status))
+
+
+@functools.lru_cache(maxsize=_COMPONENT_CACHE_SIZE)
+def render_metric_card(card: MetricCard) -> str:
+    """Render a MetricCard as HTML."""
+    label, value, icon = card.label, card.value, card.icon
+    bg, color = _METRIC_STYLE.get(card.status, _METRIC_STYLE_DEFAULT)
     icon_html = f'<span style="font-size:1.2rem;margin-right:6px;">{icon}</span>' if icon else ""
 
     return f"""
@@ -156,6 +220,30 @@ def metric_card(
     """
 
 
+def metric_row(metrics: Sequence[tuple[str, ...]]) -> str:
+    """Responsive grid of metric cards, rendered as one markdown block.
+
+    Args:
+        metrics: metric_card argument tuples: (label, value[, icon[, status]]).
+    """
+    # Minified so no whitespace-only line splits the markdown HTML block
+    cards = _minify("".join(render_metric_card(MetricCard(*m)) for m in metrics))
+    return (
+        '<div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(160px,1fr));gap:12px;">'
+        f"{cards}</div>"
+    )
+
+
+# (background, text color, glow) per confidence level
+_CONFIDENCE_STYLES = {
+    "high": ("rgba(72,187,120,0.15)", "#9ae6b4", "rgba(72,187,120,0.3)"),
+    "medium": ("rgba(236,201,75,0.15)", "#fbd38d", "rgba(236,201,75,0.3)"),
+    "low": ("rgba(245,101,101,0.15)", "#feb2b2", "rgba(245,101,101,0.3)"),
+}
+_CONFIDENCE_STYLE_DEFAULT = _CONFIDENCE_STYLES["medium"]
+
+
+@functools.lru_cache(maxsize=_COMPONENT_CACHE_SIZE)
 def confidence_badge(label: str, confidence: float, level: str = "medium") -> str:
     """Pill badge with glow effect for confidence display.
 
@@ -164,12 +252,7 @@ def confidence_badge(label: str, confidence: float, level: str = "medium") -> st
         confidence: 0-1 confidence value.
         level: 'high', 'medium', or 'low'.
     """
-    styles = {
-        "high": ("rgba(72,187,120,0.15)", "#9ae6b4", "rgba(72,187,120,0.3)"),
-        "medium": ("rgba(236,201,75,0.15)", "#fbd38d", "rgba(236,201,75,0.3)"),
-        "low": ("rgba(245,101,101,0.15)", "#feb2b2", "rgba(245,101,101,0.3)"),
-    }
-    bg, color, glow = styles.get(level, styles["medium"])
+    bg, color, glow = _CONFIDENCE_STYLES.get(level, _CONFIDENCE_STYLE_DEFAULT)
     pct = int(confidence * 100)
 
     return f"""
@@ -193,9 +276,13 @@ def color_palette(colors: list[str]) -> str:
     Args:
         colors: List of hex color strings (e.g. ['#FF6B6B', '#4ECDC4']).
     """
-    swatches = ""
-    for c in colors[:8]:
-        swatches += f"""
+    return _color_palette(tuple(colors[:8]))
+
+
+@functools.lru_cache(maxsize=_COMPONENT_CACHE_SIZE)
+def _color_palette(colors: tuple[str, ...]) -> str:
+    swatches = "".join(
+        f"""
         <div style="display:flex;flex-direction:column;align-items:center;gap:4px;">
             <div style="
                 width:36px;height:36px;border-radius:8px;
@@ -206,6 +293,8 @@ def color_palette(colors: list[str]) -> str:
                 {c}
             </span>
         </div>"""
+        for c in colors
+    )
 
     return f"""
     <div style="display:flex;gap:10px;flex-wrap:wrap;margin:8px 0;">
@@ -214,6 +303,14 @@ def color_palette(colors: list[str]) -> str:
     """
 
 
+# (dot color, dot glow) for asset_preview_card, indexed by is_valid
+_ASSET_STATUS_DOT = (
+    ("var(--color-error)", "rgba(245,101,101,0.4)"),
+    ("var(--color-success)", "rgba(72,187,120,0.4)"),
+)
+
+
+@functools.lru_cache(maxsize=_COMPONENT_CACHE_SIZE)
 def asset_preview_card(
     key: str,
     image_url: str = "",
@@ -228,10 +325,9 @@ def asset_preview_card(
         is_valid: Whether the asset generated successfully.
         error: Error message if invalid.
     """
-    dot_color = "var(--color-success)" if is_valid else "var(--color-error)"
-    dot_glow = "rgba(72,187,120,0.4)" if is_valid else "rgba(245,101,101,0.4)"
+    dot_color, dot_glow = _ASSET_STATUS_DOT[bool(is_valid)]
     status_text = "Ready" if is_valid else (error[:40] if error else "Failed")
-    status_color = "var(--color-success)" if is_valid else "var(--color-error)"
+    status_color = dot_color
 
     return f"""
     <div style="
@@ -266,16 +362,17 @@ def network_badges(networks: list[str], file_size_mb: float = 0) -> str:
         networks: List of compatible network names.
         file_size_mb: File size for limit-aware coloring.
     """
-    all_networks = {
-        "Google Ads": 5,
-        "Unity": 5,
-        "IronSource": 5,
-        "AppLovin": 5,
-        "Facebook": 2,
-    }
-    badges = ""
-    for name, limit in all_networks.items():
-        compatible = file_size_mb <= limit if file_size_mb > 0 else name in networks
+    compatible: set[str] | list[str] = networks
+    if file_size_mb > 0:
+        compatible = _size_compatible_networks(file_size_mb)
+    return _network_badges(frozenset(compatible))
+
+
+@functools.lru_cache(maxsize=_COMPONENT_CACHE_SIZE)
+def _network_badges(compatible_networks: frozenset[str]) -> str:
+    badge_parts = []
+    for name, _ in NETWORK_SIZE_LIMITS:
+        compatible = name in compatible_networks
         if compatible:
             bg = "rgba(72,187,120,0.15)"
             color = "#9ae6b4"
@@ -285,18 +382,20 @@ def network_badges(networks: list[str], file_size_mb: float = 0) -> str:
             color = "var(--text-muted)"
             icon = "&#10007;"
 
-        badges += f"""
+        badge_parts.append(f"""
         <span style="
             display:inline-flex;align-items:center;gap:4px;
             padding:4px 12px;border-radius:14px;
             font-size:0.78rem;font-weight:500;
             background:{bg};color:{color};
             margin:3px;
-        ">{icon} {name}</span>"""
+        ">{icon} {name}</span>""")
+    badges = "".join(badge_parts)
 
     return f'<div style="display:flex;flex-wrap:wrap;gap:4px;margin:8px 0;">{badges}</div>'
 
 
+@functools.lru_cache(maxsize=_COMPONENT_CACHE_SIZE)
 def success_banner(title: str, message: str = "") -> str:
     """Animated celebration card.
 
@@ -326,6 +425,7 @@ def success_banner(title: str, message: str = "") -> str:
     """
 
 
+@functools.lru_cache(maxsize=_COMPONENT_CACHE_SIZE)
 def empty_state(title: str, message: str = "", icon: str = "") -> str:
     """Centered placeholder with large icon.
 
@@ -355,21 +455,29 @@ def empty_state(title: str, message: str = "", icon: str = "") -> str:
     """
 
 
+# Workflow steps shown in the sidebar timeline
+_SIDEBAR_STEPS: tuple[tuple[int, str], ...] = (
+    (1, "Input Game"),
+    (2, "Analyze & Review"),
+    (3, "Generate Assets"),
+    (4, "Export Playable"),
+)
+
+
 def sidebar_progress(current_step: int) -> str:
     """Vertical timeline with circles and connecting lines.
 
     Args:
         current_step: The active step number (1-based).
     """
-    steps = [
-        (1, "Input Game"),
-        (2, "Analyze & Review"),
-        (3, "Generate Assets"),
-        (4, "Export Playable"),
-    ]
-
-    items = ""
-    for i, (num, label) in enumerate(steps):
+    if 1 <= current_step <= len(_SIDEBAR_PROGRESS_HTML):
+        return _SIDEBAR_PROGRESS_HTML[current_step - 1]
+    return _render_sidebar_progress(current_step)
+
+
+def _render_sidebar_progress(current_step: int) -> str:
+    item_parts = []
+    for i, (num, label) in enumerate(_SIDEBAR_STEPS):
         if num < current_step:
             circle_bg = "var(--color-success)"
             circle_border = "var(--color-success)"
@@ -391,7 +499,7 @@ def sidebar_progress(current_step: int) -> str:
 
         # Connecting line (not for last item)
         line = ""
-        if i < len(steps) - 1:
+        if i < len(_SIDEBAR_STEPS) - 1:
             line_color = "var(--color-success)" if num < current_step else "var(--glass-border)"
             line = f"""
             <div style="
@@ -400,7 +508,7 @@ def sidebar_progress(current_step: int) -> str:
                 margin-left:13px;
             "></div>"""
 
-        items += f"""
+        item_parts.append(f"""
         <div style="display:flex;align-items:center;gap:12px;">
             <div style="
                 width:28px;height:28px;border-radius:50%;
@@ -414,11 +522,26 @@ def sidebar_progress(current_step: int) -> str:
                 {label}
             </span>
         </div>
-        {line}"""
+        {line}""")
+    items = "".join(item_parts)
 
     return f'<div style="padding:4px 0;">{items}</div>'
 
 
+# The timeline for each real step, rendered once at import
+_SIDEBAR_PROGRESS_HTML = tuple(
+    _minify(_render_sidebar_progress(num)) for num, _ in _SIDEBAR_STEPS
+)
+
+
+# (dot color, label color, status text) for api_status_row, indexed by is_set
+_API_STATUS = (
+    ("var(--color-error)", "var(--text-muted)", "Missing"),
+    ("var(--color-success)", "var(--text-secondary)", "Connected"),
+)
+
+
+@functools.lru_cache(maxsize=_COMPONENT_CACHE_SIZE)
 def api_status_row(name: str, is_set: bool) -> str:
     """Colored dot + label row for API key status.
 
@@ -426,9 +549,7 @@ def api_status_row(name: str, is_set: bool) -> str:
         name: Display name for the API key.
         is_set: Whether the key is configured.
     """
-    dot_color = "var(--color-success)" if is_set else "var(--color-error)"
-    label_color = "var(--text-secondary)" if is_set else "var(--text-muted)"
-    status_text = "Connected" if is_set else "Missing"
+    dot_color, label_color, status_text = _API_STATUS[bool(is_set)]
 
     return f"""
     <div style="display:flex;align-items:center;justify-content:space-between;padding:4px 0;">
@@ -445,6 +566,14 @@ def api_status_row(name: str, is_set: bool) -> str:
     """
 
 
+# (minimum credits, color) tiers for credits_display; below all tiers is an error
+_CREDIT_TIERS = (
+    (100, "var(--color-success)"),
+    (50, "var(--color-warning)"),
+)
+
+
+@functools.lru_cache(maxsize=_COMPONENT_CACHE_SIZE)
 def credits_display(credits: int | str) -> str:
     """Counter with color-coded progress bar.
 
@@ -459,15 +588,10 @@ def credits_display(credits: int | str) -> str:
     else:
         cred_int = int(credits)
         bar_pct = min(cred_int, 500) / 500 * 100  # Normalize to 500
-        if cred_int >= 100:
-            bar_color = "var(--color-success)"
-            value_color = "var(--color-success)"
-        elif cred_int >= 50:
-            bar_color = "var(--color-warning)"
-            value_color = "var(--color-warning)"
-        else:
-            bar_color = "var(--color-error)"
-            value_color = "var(--color-error)"
+        bar_color = value_color = next(
+            (color for threshold, color in _CREDIT_TIERS if cred_int >= threshold),
+            "var(--color-error)",
+        )
         cred_str = str(cred_int)
 
     return f"""
@@ -493,10 +617,18 @@ def phone_preview(b64_html: str, width: int = 320, height: int = 480) -> str:
         width: Playable width.
         height: Playable height.
     """
+    # The payload is multi-MB and unique per build, so only the frame is
+    # cached and the payload is copied once, by the join
+    prefix, suffix = _phone_frame(width, height)
+    return "".join((prefix, b64_html, suffix))
+
+
+@functools.lru_cache(maxsize=_COMPONENT_CACHE_SIZE)
+def _phone_frame(width: int, height: int) -> tuple[str, str]:
+    """Phone mockup HTML before and after the iframe's base64 payload."""
     frame_w = width + 24
-    frame_h = height + 80
 
-    return f"""
+    prefix = f"""
     <div style="
         display:flex;justify-content:center;margin:20px 0;
     ">
@@ -517,7 +649,8 @@ def phone_preview(b64_html: str, width: int = 320, height: int = 480) -> str:
             "></div>
             <!-- Screen -->
             <iframe
-                src="data:text/html;base64,{b64_html}"
+                src="data:text/html;base64,"""
+    suffix = f""""
                 width="{width}"
                 height="{height}"
                 style="border:none;border-radius:8px;display:block;background:#000;"
@@ -531,19 +664,24 @@ def phone_preview(b64_html: str, width: int = 320, height: int = 480) -> str:
         </div>
     </div>
     """
+    return _minify(prefix), _minify(suffix)
 
 
-def gradient_divider() -> str:
-    """Gradient horizontal divider replacing st.markdown('---')."""
-    return """
+GRADIENT_DIVIDER = _minify("""
     <div style="
         height:1px;
         background:linear-gradient(90deg, transparent, var(--glass-border), transparent);
         margin:20px 0;
     "></div>
-    """
+    """)
+
 
+def gradient_divider() -> str:
+    """Gradient horizontal divider replacing st.markdown('---')."""
+    return GRADIENT_DIVIDER
 
+
+@functools.lru_cache(maxsize=_COMPONENT_CACHE_SIZE)
 def styled_pill(label: str, color: str = "var(--accent)") -> str:
     """Small styled pill badge.
 
@@ -565,17 +703,18 @@ def styled_pill(label: str, color: str = "var(--accent)") -> str:
     ">{label}</span>"""
 
 
-def onboarding_card() -> str:
-    """Rich onboarding card for missing API keys state."""
-    steps_html = ""
-    setup_steps = [
-        ("1", "Layer.ai API Key", "Get from app.layer.ai/settings", "LAYER_API_KEY"),
-        ("2", "Workspace ID", "Found in your Layer.ai workspace URL", "LAYER_WORKSPACE_ID"),
-        ("3", "Anthropic API Key", "Get from console.anthropic.com", "ANTHROPIC_API_KEY"),
-    ]
-
-    for num, title, desc, env_var in setup_steps:
-        steps_html += f"""
+# (number, title, description, env var) for each onboarding setup step
+_ONBOARDING_STEPS: tuple[tuple[str, str, str, str], ...] = (
+    ("1", "Layer.ai API Key", "Get from app.layer.ai/settings", "LAYER_API_KEY"),
+    ("2", "Workspace ID", "Found in your Layer.ai workspace URL", "LAYER_WORKSPACE_ID"),
+    ("3", "Anthropic API Key", "Get from console.anthropic.com", "ANTHROPIC_API_KEY"),
+)
+
+
+def _build_onboarding_card() -> str:
+    step_parts = []
+    for num, title, desc, env_var in _ONBOARDING_STEPS:
+        step_parts.append(f"""
         <div style="
             background:var(--glass-bg);
             border:1px solid var(--glass-border);
@@ -598,7 +737,8 @@ def onboarding_card() -> str:
             </div>
             <code style="font-size:0.72rem;color:var(--accent);background:rgba(255,75,75,0.1);
                          padding:2px 6px;border-radius:4px;">{env_var}</code>
-        </div>"""
+        </div>""")
+    steps_html = "".join(step_parts)
 
     return f"""
     <div style="
@@ -627,3 +767,12 @@ def onboarding_card() -> str:
         </div>
     </div>
     """
+
+
+# The onboarding card has no inputs; render it once at import
+_ONBOARDING_CARD_HTML = _minify(_build_onboarding_card())
+
+
+def onboarding_card() -> str:
+    """Rich onboarding card for missing API keys state."""
+    return _ONBOARDING_CARD_HTML
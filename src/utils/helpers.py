@@ -4,14 +4,15 @@ Shared utilities and configuration for LPS.
 Supports both local development (.env) and Streamlit Cloud (st.secrets).
 """
 
-import os
 import functools
+import os
+import sys
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional, cast
 
 import structlog
-from pydantic import Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
 # Get the project root directory (parent of src/)
@@ -19,20 +20,32 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 ENV_FILE = PROJECT_ROOT / ".env"
 
 
+_secrets_loaded = False
+
+
 def _load_streamlit_secrets_to_env():
     """
     Load Streamlit Cloud secrets into environment variables.
     This allows the same Settings class to work in both local and cloud environments.
+
+    Runs at most once per process. Streamlit is only consulted if it is
+    already imported (it always is when running under `streamlit run`), so
+    CLI and test use never pays for importing it.
     """
+    global _secrets_loaded
+    if _secrets_loaded:
+        return
+    _secrets_loaded = True
+
+    st = sys.modules.get("streamlit")
+    if st is None:
+        return  # Not running in Streamlit context
     try:
-        import streamlit as st
         if hasattr(st, 'secrets') and len(st.secrets) > 0:
             for key, value in st.secrets.items():
                 # Only set if not already in environment (allow local override)
                 if key.upper() not in os.environ:
                     os.environ[key.upper()] = str(value)
-    except ImportError:
-        pass  # Not running in Streamlit context
     except Exception as e:
         import logging
         logging.getLogger(__name__).debug("Could not load Streamlit secrets: %s", e)
@@ -47,103 +60,116 @@ if ENV_FILE.exists():
     load_dotenv(ENV_FILE, override=True)
 
 
-class Settings(BaseSettings):
-    """Application settings loaded from environment variables."""
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Application settings loaded from environment variables.
 
-    model_config = SettingsConfigDict(
-        env_file=str(ENV_FILE),
-        env_file_encoding="utf-8",
-        case_sensitive=False,
-        extra="ignore",
-    )
+    Field names match their environment variables case-insensitively
+    (LAYER_API_KEY -> layer_api_key). The .env file and Streamlit secrets
+    are already merged into os.environ at import.
+    """
 
     # Layer.ai API
-    layer_api_url: str = Field(
-        default="https://api.app.layer.ai/graphql",
-        description="Layer.ai GraphQL endpoint",
-    )
-    layer_api_key: str = Field(
-        default="",
-        description="Layer.ai API key",
-    )
-    layer_workspace_id: str = Field(
-        default="",
-        description="Layer.ai workspace ID",
-    )
+    layer_api_url: str = "https://api.app.layer.ai/graphql"  # GraphQL endpoint
+    layer_api_key: str = field(default="", repr=False)
+    layer_workspace_id: str = ""
 
     # Anthropic Claude
-    anthropic_api_key: str = Field(
-        default="",
-        description="Anthropic API key for Claude",
-    )
-    claude_model: str = Field(
-        default="claude-sonnet-4-20250514",
-        description="Claude model for vision analysis",
-    )
+    anthropic_api_key: str = field(default="", repr=False)
+    claude_model: str = "claude-sonnet-4-20250514"  # Model for vision analysis
 
     # Optional: Supabase
-    supabase_url: Optional[str] = Field(
-        default=None,
-        description="Supabase project URL",
-    )
-    supabase_key: Optional[str] = Field(
-        default=None,
-        description="Supabase anon key",
-    )
+    supabase_url: Optional[str] = None  # Project URL
+    supabase_key: Optional[str] = field(default=None, repr=False)  # Anon key
 
     # Development
-    debug: bool = Field(
-        default=False,
-        description="Enable debug mode",
-    )
-    log_level: str = Field(
-        default="INFO",
-        description="Logging level",
-    )
+    debug: bool = False
+    log_level: str = "INFO"
 
     # Forge settings
-    forge_poll_timeout: int = Field(
-        default=60,
-        description="Max seconds to poll forge task status",
-    )
-    api_fetch_timeout: int = Field(
-        default=15,
-        description="Max seconds for initial API fetches (workspace info, styles list)",
-    )
-    min_credits_required: int = Field(
-        default=50,
-        description="Minimum credits required to start forging",
-    )
+    forge_poll_timeout: int = 60  # Max seconds to poll forge task status
+    api_fetch_timeout: int = 15  # Max seconds for initial API fetches (workspace info, styles list)
+    min_credits_required: int = 50  # Minimum credits required to start forging
 
     # Playable constraints
-    max_playable_size_mb: float = Field(
-        default=5.0,
-        description="Maximum playable file size in MB",
-    )
-    max_image_dimension: int = Field(
-        default=512,
-        description="Maximum image dimension in pixels",
-    )
-
-
-@functools.lru_cache()
+    max_playable_size_mb: float = 5.0
+    max_image_dimension: int = 512  # Pixels
+
+    # Asset cache
+    asset_cache_dir: str = str(PROJECT_ROOT / ".cache" / "assets")  # Empty to disable
+    asset_cache_max_mb: int = 256
+    result_cache_dir: str = str(PROJECT_ROOT / ".cache" / "results")  # Empty for memory only
+    result_cache_max_mb: int = 256
+    result_cache_ttl_hours: float = 24  # Hours before a cached analysis or asset set expires
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "Settings":
+        """Build settings from environment variables, converting by field type.
+
+        Raises:
+            ValueError: If a variable can't be converted to its field's type.
+        """
+        env = {key.lower(): value for key, value in (os.environ if environ is None else environ).items()}
+        values = {}
+        for f in fields(cls):
+            raw = env.get(f.name)
+            if raw is not None:
+                values[f.name] = _parse_setting(f.name, f.type, raw)
+        return cls(**values)
+
+
+_TRUE_VALUES = frozenset({"1", "true", "t", "yes", "y", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "f", "no", "n", "off"})
+
+
+def _parse_setting(name: str, field_type: object, raw: str):
+    """Convert an environment string to a Settings field's type."""
+    if field_type is bool:
+        value = raw.strip().lower()
+        if value in _TRUE_VALUES:
+            return True
+        if value in _FALSE_VALUES:
+            return False
+        raise ValueError(f"Setting {name.upper()} must be a boolean, got {raw!r}")
+    if field_type in (int, float):
+        try:
+            return field_type(raw.strip())
+        except ValueError:
+            raise ValueError(
+                f"Setting {name.upper()} must be {field_type.__name__}, got {raw!r}"
+            ) from None
+    return raw
+
+
+@functools.lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get cached application settings."""
-    return Settings()
+    return Settings.from_env()
+
+
+# Level structlog was last configured for; None until setup_logging runs
+_configured_log_level: Optional[str] = None
 
 
 def setup_logging(level: Optional[str] = None) -> structlog.BoundLogger:
     """
     Configure structured logging for the application.
 
+    Configuration runs once per distinct level; repeat calls return a
+    logger without reinstalling the processor chain, so loggers cached
+    by cache_logger_on_first_use stay valid.
+
     Args:
         level: Override log level (default: from settings)
 
     Returns:
         Configured logger instance
     """
-    settings = get_settings()
-    log_level = level or settings.log_level
+    global _configured_log_level
+
+    log_level = level or get_settings().log_level
+    if log_level == _configured_log_level:
+        return cast(structlog.BoundLogger, structlog.get_logger())
 
     structlog.configure(
         processors=[
@@ -162,29 +188,38 @@ def setup_logging(level: Optional[str] = None) -> structlog.BoundLogger:
         logger_factory=structlog.PrintLoggerFactory(),
         cache_logger_on_first_use=True,
     )
+    _configured_log_level = log_level
 
-    return structlog.get_logger()
+    return cast(structlog.BoundLogger, structlog.get_logger())
 
 
-def validate_api_keys() -> dict[str, bool]:
+@functools.lru_cache(maxsize=1)
+def validate_api_keys() -> Mapping[str, bool]:
     """
     Validate that required API keys are configured.
 
+    Settings are cached for the process, so the result is too; it is
+    read-only because every caller shares it.
+
     Returns:
-        Dict mapping key names to whether they are set
+        Mapping of key names to whether they are set
     """
     settings = get_settings()
-    return {
+    return MappingProxyType({
         "layer_api_key": bool(settings.layer_api_key),
         "layer_workspace_id": bool(settings.layer_workspace_id),
         "anthropic_api_key": bool(settings.anthropic_api_key),
-    }
+    })
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
 
 
 def format_file_size(size_bytes: int) -> str:
     """Format byte size to human readable string."""
-    for unit in ["B", "KB", "MB", "GB"]:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} TB"
+    # Each unit is 2**10 times the last, so the bit length picks the unit
+    if size_bytes < 1024:
+        unit_index = 0
+    else:
+        unit_index = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit_index)):.2f} {_SIZE_UNITS[unit_index]}"
@@ -0,0 +1,13 @@
+"""
+Shared pytest fixtures.
+"""
+
+import pytest
+
+from src.assembly.builder import PlayableBuilder
+
+
+@pytest.fixture(scope="session")
+def builder() -> PlayableBuilder:
+    """Builder shared by tests; build() and export don't mutate it."""
+    return PlayableBuilder()
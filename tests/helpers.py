@@ -0,0 +1,60 @@
+"""
+Shared test helpers (non-fixture).
+"""
+
+import copy
+import re
+from dataclasses import replace
+
+from src.analysis.game_analyzer import GameAnalysis, VisualStyle
+from src.assembly.builder import PlayableConfig
+from src.generation.game_asset_generator import GeneratedAssetSet
+from src.templates.registry import MechanicType
+
+# Any "${" left in built HTML, with the variable name when there is one
+PLACEHOLDER_RE = re.compile(r"\$\{\w*\}?")
+
+_BASE_ANALYSIS = GameAnalysis(
+    game_name="Test Game",
+    publisher="Test",
+    mechanic_type=MechanicType.MATCH3,
+    mechanic_confidence=1.0,
+    mechanic_reasoning="Test",
+    visual_style=VisualStyle(
+        art_type="cartoon",
+        color_palette=["#FF0000", "#00FF00"],
+        theme="casual",
+        mood="playful",
+    ),
+    assets_needed=[],
+    recommended_template="match3",
+    template_config={},
+    core_loop_description="Test game",
+    hook_suggestion="Play Now!",
+    cta_suggestion="Download!",
+)
+
+
+def make_analysis(**overrides) -> GameAnalysis:
+    """Independent copy of a baseline GameAnalysis, with overrides.
+
+    recommended_template follows mechanic_type unless given.
+    """
+    overrides.setdefault(
+        "recommended_template",
+        overrides.get("mechanic_type", _BASE_ANALYSIS.mechanic_type).value,
+    )
+    # Deep copy so no two analyses share the baseline's lists and dicts
+    return copy.deepcopy(replace(_BASE_ANALYSIS, **overrides))
+
+
+def make_assets(**overrides) -> GeneratedAssetSet:
+    """Empty GeneratedAssetSet, with overrides."""
+    fields = {"game_name": "Test Game", "mechanic_type": MechanicType.MATCH3, "style_id": "test"}
+    return GeneratedAssetSet(**{**fields, **overrides})
+
+
+def make_config(**overrides) -> PlayableConfig:
+    """PlayableConfig with a store URL set, with overrides."""
+    fields = {"game_name": "Test Game", "store_url": "https://example.com"}
+    return PlayableConfig(**{**fields, **overrides})
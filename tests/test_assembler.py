@@ -13,13 +13,18 @@ from src.assembly.builder import (
     PlayableBuilder,
     PlayableConfig,
     PlayableResult,
+    ValidationCode,
+    ValidationError,
     HOOK_DURATION_MS,
     GAMEPLAY_DURATION_MS,
     CTA_DURATION_MS,
+    _load_template,
+    _manifest_js,
+    utf8_size,
 )
 from src.templates.registry import MechanicType
-from src.generation.game_asset_generator import GeneratedAssetSet
-from src.analysis.game_analyzer import GameAnalysis, VisualStyle
+from src.generation.game_asset_generator import GeneratedAsset
+from tests.helpers import PLACEHOLDER_RE, make_analysis, make_assets, make_config
 
 
 # =============================================================================
@@ -192,36 +197,10 @@ class TestPlayableResult:
 # =============================================================================
 
 
-def _make_analysis(mechanic_type=MechanicType.MATCH3, game_name="Test Game"):
-    """Helper to create a GameAnalysis for testing."""
-    return GameAnalysis(
-        game_name=game_name,
-        publisher="Test",
-        mechanic_type=mechanic_type,
-        mechanic_confidence=1.0,
-        mechanic_reasoning="Test",
-        visual_style=VisualStyle(
-            art_type="cartoon",
-            color_palette=["#FF0000", "#00FF00"],
-            theme="casual",
-            mood="playful",
-        ),
-        assets_needed=[],
-        recommended_template=mechanic_type.value,
-        template_config={},
-        core_loop_description="Test game",
-        hook_suggestion="Play Now!",
-        cta_suggestion="Download!",
-    )
-
-
-def _make_assets(mechanic_type=MechanicType.MATCH3, game_name="Test Game"):
-    """Helper to create an empty GeneratedAssetSet for testing."""
-    return GeneratedAssetSet(
-        game_name=game_name,
-        mechanic_type=mechanic_type,
-        style_id="test",
-    )
+@pytest.fixture(scope="module")
+def default_result(builder):
+    """Build of the default analysis and assets, shared by read-only checks."""
+    return builder.build(make_analysis(), make_assets(), make_config())
 
 
 class TestPlayableBuilder:
@@ -233,24 +212,16 @@ class TestPlayableBuilder:
         assert builder is not None
         assert builder.templates_dir.exists()
 
-    def test_build_produces_html(self):
+    def test_build_produces_html(self, default_result):
         """Test that build produces HTML output."""
-        builder = PlayableBuilder()
-        analysis = _make_analysis()
-        assets = _make_assets()
-        config = PlayableConfig(game_name="Test Game", store_url="https://example.com")
-
-        result = builder.build(analysis, assets, config)
+        assert default_result is not None
+        assert default_result.file_size_bytes > 0
+        assert "openStoreUrl" in default_result.html
 
-        assert result is not None
-        assert result.file_size_bytes > 0
-        assert "openStoreUrl" in result.html
-
-    def test_build_substitutes_config(self):
+    def test_build_substitutes_config(self, builder):
         """Test that config values are substituted into HTML."""
-        builder = PlayableBuilder()
-        analysis = _make_analysis()
-        assets = _make_assets()
+        analysis = make_analysis()
+        assets = make_assets()
         config = PlayableConfig(
             game_name="Test Game",
             title="My Title",
@@ -262,27 +233,19 @@ class TestPlayableBuilder:
 
         result = builder.build(analysis, assets, config)
 
-        assert "My Title" in result.html
-        assert "https://test.example.com" in result.html
-        assert "Custom Hook" in result.html
-        assert "Custom CTA" in result.html
-        assert "#123456" in result.html
+        expected = ("My Title", "https://test.example.com", "Custom Hook", "Custom CTA", "#123456")
+        missing = [value for value in expected if value not in result.html]
+        assert not missing, f"Not substituted: {missing}"
+        assert PLACEHOLDER_RE.search(result.html) is None
 
-    def test_build_no_unsubstituted_placeholders(self):
+    def test_build_no_unsubstituted_placeholders(self, default_result):
         """Test that no ${} placeholders remain after build."""
-        builder = PlayableBuilder()
-        analysis = _make_analysis()
-        assets = _make_assets()
-        config = PlayableConfig(game_name="Test", store_url="https://example.com")
-
-        result = builder.build(analysis, assets, config)
+        match = PLACEHOLDER_RE.search(default_result.html)
+        assert match is None, f"Unsubstituted placeholder: {match.group()}"
 
-        assert "${" not in result.html, "Unsubstituted placeholders found"
-
-    def test_build_from_template(self):
+    def test_build_from_template(self, builder):
         """Test building directly from mechanic type."""
-        builder = PlayableBuilder()
-        assets = _make_assets(mechanic_type=MechanicType.TAPPER)
+        assets = make_assets(mechanic_type=MechanicType.TAPPER)
         config = PlayableConfig(game_name="Tapper Test", store_url="https://example.com")
 
         result = builder.build_from_template(
@@ -295,19 +258,115 @@ class TestPlayableBuilder:
         assert result.mechanic_type == MechanicType.TAPPER
         assert result.file_size_bytes > 0
 
-    def test_validate_size_limit(self):
+    def test_build_embeds_shared_data_uri_once(self, builder):
+        """Test that keys sharing an image embed its data URI only once."""
+        assets = make_assets()
+        uri = "data:image/png;base64,c2hhcmVk"
+        for key in ("tile_1", "tile_2", "tile_3"):
+            assets.assets[key] = GeneratedAsset(
+                key=key, prompt="tile", image_url=None, image_data=b"shared",
+                base64_data=uri, generation_time=0.0,
+            )
+        config = PlayableConfig(game_name="Test Game", store_url="https://example.com")
+
+        result = builder.build(make_analysis(), assets, config)
+
+        assert result.html.count(uri) == 1
+        assert '"tile_1": _u0, "tile_2": _u0, "tile_3": _u0' in result.html
+        assert result.is_valid
+
+    def test_substitute_template_replaces_only_braced_placeholders(self, builder, tmp_path):
+        """Test only known ${NAME} placeholders are replaced; other "$" text is kept."""
+        text = "a $$ b ${X} $Y ${UNKNOWN} $ 1 $X$X end"
+        template_path = tmp_path / "template.html"
+        template_path.write_text(text, encoding="utf-8")
+        subs = {"X": "1", "Y": 2}
+
+        html = builder._substitute_template(_load_template(template_path), subs)
+
+        assert html == "a $$ b 1 $Y ${UNKNOWN} $ 1 $X$X end"
+
+    def test_export_writes_utf8_across_chunks(self, builder, tmp_path):
+        """Test chunked HTML/ZIP export round-trips multi-byte text."""
+        import zipfile
+
+        html = "<html>Spiel jetzt \u2014 \U0001F3AE</html>" * 5
+        result = PlayableResult(
+            html=html,
+            file_size_bytes=len(html.encode("utf-8")),
+            mechanic_type=MechanicType.TAPPER,
+            assets_embedded=0,
+            is_valid=True,
+        )
+
+        with patch("src.assembly.builder.HTML_WRITE_CHUNK_CHARS", 7):
+            builder.export_html(result, tmp_path / "out" / "index.html")
+            builder.export_zip(result, tmp_path / "out" / "playable.zip")
+
+        assert (tmp_path / "out" / "index.html").read_text(encoding="utf-8") == html
+        with zipfile.ZipFile(tmp_path / "out" / "playable.zip") as zf:
+            assert zf.read("index.html").decode("utf-8") == html
+
+    def test_zip_export_streams_without_writestr(self, tmp_path):
+        """Test ZIP export compresses slice by slice, not via one in-memory copy."""
+        import zipfile
+
+        from src.assembly.builder import write_html_zip
+
+        html = "<html>" + "QUJD" * 10_000 + "</html>"
+
+        with patch("src.assembly.builder.HTML_WRITE_CHUNK_CHARS", 4096), \
+                patch.object(zipfile.ZipFile, "writestr", side_effect=AssertionError):
+            write_html_zip(html, tmp_path / "playable.zip")
+
+        with zipfile.ZipFile(tmp_path / "playable.zip") as zf:
+            assert zf.read("index.html").decode("utf-8") == html
+
+    def test_utf8_size_matches_encoded_length(self):
+        """Test UTF-8 sizing for ASCII and multi-byte text across slices."""
+        ascii_html = "<html>data:image/png;base64,QUJD</html>"
+        html = "<html>Spiel jetzt \u2014 \U0001F3AE</html>" * 5
+
+        with patch("src.assembly.builder.HTML_WRITE_CHUNK_CHARS", 7):
+            assert utf8_size(ascii_html) == len(ascii_html.encode("utf-8"))
+            assert utf8_size(html) == len(html.encode("utf-8"))
+
+    def test_validate_size_limit(self, builder):
         """Test that oversized playables are flagged."""
-        builder = PlayableBuilder()
-        errors = builder._validate("x" * (6 * 1024 * 1024))  # 6MB
+        errors = builder._validate("<html></html>", size_bytes=6 * 1024 * 1024)
 
-        assert any("exceeds" in e for e in errors)
+        assert ValidationCode.SIZE_EXCEEDED in {e.code for e in errors}
 
-    def test_validate_missing_store_url(self):
+    def test_validate_missing_store_url(self, builder):
         """Test validation catches missing openStoreUrl."""
-        builder = PlayableBuilder()
         errors = builder._validate("<html><body>No store url</body></html>")
 
-        assert any("openStoreUrl" in e for e in errors)
+        assert ValidationCode.MISSING_STORE_URL in {e.code for e in errors}
+
+    def test_validate_unsubstituted_placeholders(self, builder):
+        """Test validation reports leftover placeholders in declaration order."""
+        errors = builder._validate(
+            "<script>function openStoreUrl(){}</script>${CTA_TEXT} ${TITLE} ${TITLE}"
+        )
+
+        assert errors == [ValidationError(
+            ValidationCode.UNSUBSTITUTED_PLACEHOLDERS,
+            "Unsubstituted template variables found: ['${TITLE}', '${CTA_TEXT}']",
+        )]
+
+    @pytest.mark.parametrize("manifest", [
+        {"player": "data:image/png;base64,AAAA"},
+        {"tile_1": "data:image/png;base64,AAAA", "tile_2": "data:image/png;base64,AAAA"},
+    ])
+    def test_validate_external_urls_only_in_manifest(self, builder, manifest):
+        """Test URLs are flagged inside either manifest form but not after it."""
+        store = "<script>function openStoreUrl(){}</script>"
+        clean = f"{store}var ASSETS = {_manifest_js(manifest)}; // see https://example.com"
+        external = dict(manifest, bg="https://cdn.example.com/bg.png")
+        tainted = f"{store}var ASSETS = {_manifest_js(external)};"
+
+        assert builder._validate(clean) == []
+        assert ValidationCode.EXTERNAL_ASSET_URLS in {e.code for e in builder._validate(tainted)}
 
 
 if __name__ == "__main__":
@@ -5,16 +5,22 @@ Test coverage for asset generation functionality using
 the v2.0 API (src.generation.game_asset_generator).
 """
 
+import os
 import pytest
+from io import BytesIO
 from unittest.mock import Mock, patch
 
+import httpx
+from PIL import Image
+
 from src.generation.game_asset_generator import (
+    AssetDiskCache,
     GameAssetGenerator,
     GeneratedAssetSet,
     GeneratedAsset,
 )
 from src.templates.registry import MechanicType, TEMPLATE_REGISTRY, AssetRequirement
-from src.layer_client import StyleConfig
+from src.layer_client import StyleConfig, GeneratedImage, GenerationStatus
 from src.analysis.game_analyzer import GameAnalysis, VisualStyle, AssetNeed
 
 
@@ -191,32 +197,18 @@ class TestTemplateAssetRequirements:
                 f"Template {mechanic_type.value} has no required assets"
             )
 
-    def test_match3_template_requirements(self):
-        """Test Match-3 template has expected asset keys."""
-        template = TEMPLATE_REGISTRY.get(MechanicType.MATCH3)
-        assert template is not None
-
-        asset_keys = {a.key for a in template.required_assets}
-        assert "tile_1" in asset_keys
-        assert "background" in asset_keys
-
-    def test_runner_template_requirements(self):
-        """Test Runner template has expected asset keys."""
-        template = TEMPLATE_REGISTRY.get(MechanicType.RUNNER)
-        assert template is not None
-
-        asset_keys = {a.key for a in template.required_assets}
-        assert "player" in asset_keys
-        assert "background" in asset_keys
-
-    def test_tapper_template_requirements(self):
-        """Test Tapper template has expected asset keys."""
-        template = TEMPLATE_REGISTRY.get(MechanicType.TAPPER)
+    @pytest.mark.parametrize("mechanic_type,expected_keys", [
+        (MechanicType.MATCH3, {"tile_1", "background"}),
+        (MechanicType.RUNNER, {"player", "background"}),
+        (MechanicType.TAPPER, {"target", "background"}),
+    ])
+    def test_template_requirements(self, mechanic_type, expected_keys):
+        """Test each template has its expected asset keys."""
+        template = TEMPLATE_REGISTRY.get(mechanic_type)
         assert template is not None
 
         asset_keys = {a.key for a in template.required_assets}
-        assert "target" in asset_keys
-        assert "background" in asset_keys
+        assert expected_keys <= asset_keys
 
 
 # =============================================================================
@@ -265,6 +257,162 @@ class TestGameAssetGenerator:
 
         assert uri.startswith("data:image/jpeg;base64,")
 
+    def test_data_uri_matches_stdlib_encoding(self):
+        """Test chunked encoding matches a single-shot base64 encode."""
+        import base64
+
+        mock_client = Mock()
+        generator = GameAssetGenerator(layer_client=mock_client)
+
+        # Spans several encode chunks and ends on a padded tail
+        png_data = b'\x89PNG\r\n\x1a\n' + bytes(range(256)) * 1000 + b'\x01'
+        uri = generator._to_data_uri(png_data)
+
+        expected = base64.b64encode(png_data).decode("ascii")
+        assert uri == f"data:image/png;base64,{expected}"
+
+    def test_generate_for_game_downloads_concurrently(self):
+        """Test generated images are fetched in one batch and errors are isolated."""
+        buffer = BytesIO()
+        Image.new("RGB", (1024, 512), "red").save(buffer, format="PNG")
+        png_bytes = buffer.getvalue()
+
+        mock_client = Mock()
+        mock_client.generate_many_with_polling.return_value = [
+            GeneratedImage(
+                task_id=str(i),
+                status=GenerationStatus.COMPLETED,
+                image_url=f"https://cdn.example.com/{i}.png",
+            )
+            for i in (1, 2)
+        ]
+        generator = GameAssetGenerator(layer_client=mock_client)
+
+        analysis = GameAnalysis(
+            game_name="Tapper",
+            publisher=None,
+            mechanic_type=MechanicType.TAPPER,
+            mechanic_confidence=1.0,
+            mechanic_reasoning="Test",
+            visual_style=VisualStyle(
+                art_type="cartoon",
+                color_palette=["#FF0000"],
+                theme="casual",
+                mood="playful",
+            ),
+            assets_needed=[],
+            recommended_template="tapper",
+            template_config={},
+            core_loop_description="Test",
+            hook_suggestion="Tap!",
+            cta_suggestion="Download",
+        )
+
+        def handler(request):
+            if request.url.path.startswith("/2"):
+                return httpx.Response(404)
+            return httpx.Response(200, content=png_bytes)
+
+        with generator:
+            generator._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            asset_set = generator.generate_for_game(analysis, style_id="style")
+
+        assert list(asset_set.assets) == ["target", "background"]
+        assert asset_set.assets["target"].is_valid
+        assert asset_set.assets["target"].width == 512
+        assert "Download/optimize failed" in asset_set.assets["background"].error
+
+    def test_optimize_jpeg_downscale_keeps_exact_size(self):
+        """Test reduced-scale JPEG decoding still yields the exact target size."""
+        buffer = BytesIO()
+        Image.new("RGB", (2000, 1500), "green").save(buffer, format="JPEG")
+        generator = GameAssetGenerator(layer_client=Mock())
+
+        with patch("src.generation.game_asset_generator.pyvips", None):
+            data, width, height = generator._optimize(buffer.getvalue())
+
+        assert (width, height) == (512, 384)
+        assert Image.open(BytesIO(data)).size == (512, 384)
+
+    def test_cached_asset_skips_download(self, tmp_path):
+        """Test a disk cache hit rebuilds the asset without downloading."""
+        cache = AssetDiskCache(tmp_path)
+        cache.put("https://cdn.example.com/1.png", 512, 85, "data:image/png;base64,AAEC", 8, 4)
+        generator = GameAssetGenerator(layer_client=Mock(), cache=cache)
+
+        asset = generator._cached_asset("target", "p", "https://cdn.example.com/1.png", 1.0)
+
+        assert asset.is_valid
+        assert asset.image_data == b"\x00\x01\x02"
+        assert (asset.width, asset.height) == (8, 4)
+        assert generator._cached_asset("target", "p", "https://cdn.example.com/2.png", 1.0) is None
+
+    def test_disk_cache_evicts_least_recently_used(self, tmp_path):
+        """Test eviction drops the oldest entries once over the size budget."""
+        cache = AssetDiskCache(tmp_path, max_bytes=200)
+        for i in range(3):
+            cache.put(f"https://cdn.example.com/{i}.png", 512, 85, "data:," + "A" * 40, 1, 1)
+        paths = {i: cache._path(f"https://cdn.example.com/{i}.png", 512, 85) for i in range(3)}
+        for i, path in paths.items():
+            os.utime(path, (i, i))
+
+        cache.evict()
+
+        assert not paths[0].exists()
+        assert paths[1].exists() and paths[2].exists()
+
+    def test_disk_cache_skips_scan_while_under_budget(self, tmp_path):
+        """Test eviction reuses the running size instead of re-scanning."""
+        cache = AssetDiskCache(tmp_path)
+        cache.evict()
+        cache.put("https://cdn.example.com/1.png", 512, 85, "data:,AAAA", 1, 1)
+
+        with patch.object(type(tmp_path), "glob", side_effect=AssertionError("scanned")):
+            cache.evict()
+
+    def test_fit_budget_recompresses_png_only_when_over_budget(self):
+        """Test PNGs are losslessly recompressed only when over the size budget."""
+        image = Image.effect_mandelbrot((256, 256), (-2, -1.5, 1, 1.5), 100).convert("RGBA")
+        buffer = BytesIO()
+        image.save(buffer, format="PNG", compress_level=1)
+        generator = GameAssetGenerator(layer_client=Mock())
+        asset = GeneratedAsset(
+            key="player",
+            prompt="p",
+            image_url="u",
+            image_data=buffer.getvalue(),
+            base64_data=generator._to_data_uri(buffer.getvalue()),
+            generation_time=0.0,
+        )
+        original = asset.base64_data
+
+        assert generator._fit_budget([asset]) == [asset]
+
+        generator.OPTIMIZE_BUDGET_BYTES = 0
+        [fitted] = generator._fit_budget([asset])
+        assert len(fitted.base64_data) < len(original)
+        assert Image.open(BytesIO(fitted.image_data)).tobytes() == image.tobytes()
+        assert asset.base64_data is original  # The caller's asset is untouched
+
+    def test_build_asset_reuses_identical_downloads(self):
+        """Test identical image bytes are optimized and encoded only once."""
+        buffer = BytesIO()
+        Image.new("RGB", (64, 64), "blue").save(buffer, format="PNG")
+        generator = GameAssetGenerator(layer_client=Mock())
+
+        batch, next_batch = {}, {}
+
+        with patch.object(generator, "_optimize", wraps=generator._optimize) as optimize:
+            first = generator._build_asset("tile_1", "p", "u1", 0.0, buffer.getvalue(), batch)
+            second = generator._build_asset("tile_2", "p", "u2", 0.0, buffer.getvalue(), batch)
+            assert optimize.call_count == 1
+            # Reuse is scoped to one batch; the generator itself keeps nothing
+            generator._build_asset("tile_1", "p", "u1", 0.0, buffer.getvalue(), next_batch)
+
+        assert optimize.call_count == 2
+        assert second.key == "tile_2"
+        assert second.base64_data is first.base64_data
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
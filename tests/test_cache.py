@@ -0,0 +1,399 @@
+"""
+Tests for the pipeline result cache (src.cache).
+"""
+
+import os
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.cache import CACHE_SCHEMA_VERSION, ResultCache, assets_key, screenshots_key
+from src.generation.game_asset_generator import GeneratedAssetSet
+from src.playable_factory import PlayableFactory
+from src.templates.registry import MechanicType
+from tests.helpers import make_analysis
+
+
+class TestCacheKeys:
+    """Tests for content-addressed cache keys."""
+
+    def test_screenshots_key_hashes_file_contents(self, tmp_path):
+        """Test a file path and its bytes produce the same key."""
+        path = tmp_path / "shot.png"
+        path.write_bytes(b"\x89PNG" * 50_000)
+
+        assert screenshots_key([path]) == screenshots_key([path.read_bytes()])
+        assert screenshots_key([str(path)]) == screenshots_key([path])
+        assert screenshots_key([path], "Hint") != screenshots_key([path])
+
+    def test_screenshots_key_accepts_base64_strings(self):
+        """Test long base64 strings are hashed rather than treated as paths."""
+        assert screenshots_key(["QUJD" * 5000]) != screenshots_key(["QUJE" * 5000])
+
+    def test_screenshots_key_covers_every_screenshot_in_order(self):
+        """Test keys over several screenshots change with content and order."""
+        shots = [bytes([i]) * 10_000 for i in range(4)]
+
+        assert screenshots_key(shots) == screenshots_key(list(shots))
+        assert screenshots_key(shots) != screenshots_key(shots[::-1])
+        assert screenshots_key(shots) != screenshots_key(shots[:3] + [b"other"])
+
+    def test_assets_key_depends_on_analysis_and_style(self):
+        """Test asset keys change with the analysis or style."""
+        analysis = make_analysis()
+
+        assert assets_key(analysis, "style") == assets_key(make_analysis(), "style")
+        assert assets_key(analysis, "style") != assets_key(analysis, "other")
+        other = make_analysis(game_name="Other")
+        assert assets_key(analysis, "style") != assets_key(other, "style")
+
+
+class TestResultCache:
+    """Tests for the two-tier result cache."""
+
+    def test_memory_hit_and_stats(self):
+        """Test values round-trip in memory and hits/misses are counted."""
+        cache = ResultCache()
+
+        assert cache.get("k") is None
+        cache.put("k", {"value": 1})
+
+        assert cache.get("k") == {"value": 1}
+        assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    def test_memory_hits_are_copies(self):
+        """Test mutating a stored or returned value doesn't change later hits."""
+        cache = ResultCache()
+        analysis = make_analysis()
+        cache.put("k", analysis)
+        analysis.game_name = "Mutated"
+        cache.get("k").visual_style.color_palette.append("#000000")
+
+        assert cache.get("k") == make_analysis()
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is dropped past max_entries."""
+        cache = ResultCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+    def test_ttl_expiry(self):
+        """Test entries older than the TTL are misses."""
+        cache = ResultCache(ttl_seconds=10)
+        with patch("src.cache.time.time", return_value=1000.0):
+            cache.put("k", "v")
+        with patch("src.cache.time.time", return_value=1011.0):
+            assert cache.get("k") is None
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        """Test persisted entries are found by a fresh cache."""
+        ResultCache(cache_dir=tmp_path).put("k", make_analysis())
+
+        cached = ResultCache(cache_dir=tmp_path).get("k")
+
+        assert cached == make_analysis()
+
+    def test_disk_tier_bounded_by_bytes(self, tmp_path):
+        """Test the oldest persisted entries are dropped past max_bytes."""
+        cache = ResultCache(cache_dir=tmp_path, max_bytes=150_000)
+        for i, key in enumerate(("a", "b", "c")):
+            cache.put(key, b"x" * 60_000)
+            os.utime(cache._path(tmp_path, key), (1000 + i, 1000 + i))  # Oldest first
+
+        fresh = ResultCache(cache_dir=tmp_path)
+        assert fresh.get("a") is None
+        assert fresh.get("c") == b"x" * 60_000
+
+    def test_disk_tier_scanned_only_past_limits(self, tmp_path):
+        """Test puts track disk usage instead of listing the directory each time."""
+        cache = ResultCache(cache_dir=tmp_path, max_entries=3)
+
+        with patch.object(Path, "glob", autospec=True, side_effect=Path.glob) as glob:
+            for key in "abcd":
+                cache.put(key, key)
+
+        assert glob.call_count == 2  # On first use, then once past max_entries
+        assert len(list(tmp_path.glob("*.pkl"))) == 3
+
+    def test_unpicklable_value_kept_in_memory_only(self, tmp_path):
+        """Test a value that can't be pickled is a failed store, not an error."""
+        cache = ResultCache(cache_dir=tmp_path)
+        value = lambda: None  # noqa: E731
+
+        cache.put("k", value)
+
+        assert cache.get("k") is value
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unloadable_disk_entry_is_a_miss(self, tmp_path):
+        """Test corrupt or stale-schema pickles are treated as misses."""
+        cache = ResultCache(cache_dir=tmp_path)
+        cache._path(tmp_path, "k").write_bytes(b"\x80\x05garbage")
+
+        assert cache.get("k") is None
+
+    def test_disk_entries_namespaced_by_schema_version(self, tmp_path):
+        """Test a schema bump hides entries pickled under the old version."""
+        ResultCache(cache_dir=tmp_path).put("k", "v")
+
+        with patch("src.cache.CACHE_SCHEMA_VERSION", CACHE_SCHEMA_VERSION + 1):
+            assert ResultCache(cache_dir=tmp_path).get("k") is None
+
+
+class TestFactoryCaching:
+    """Tests for cache use in PlayableFactory."""
+
+    def test_repeat_run_skips_analysis_and_generation(self):
+        """Test identical inputs reuse the cached analysis and asset set."""
+        factory = PlayableFactory(cache=ResultCache())
+        factory._anthropic = Mock()
+        factory._anthropic.messages.create.return_value.content = [
+            Mock(text='{"game_name": "Test Game", "mechanic_type": "TAPPER"}')
+        ]
+        asset_set = GeneratedAssetSet(
+            game_name="Test Game", mechanic_type=MechanicType.TAPPER, style_id="style"
+        )
+
+        with patch("src.playable_factory.GameAssetGenerator") as generator_cls:
+            generator = generator_cls.return_value
+            generator.generate_for_game.return_value = asset_set
+            for _ in range(2):
+                result = factory.create_from_screenshots([b"screenshot"], style_id="style")
+
+        assert factory._anthropic.messages.create.call_count == 1
+        assert generator.generate_for_game.call_count == 1
+        assert result.assets == asset_set
+        assert result.assets is not asset_set  # Hits are copies
+
+    async def test_async_entry_point_runs_pipelines_concurrently(self):
+        """Test the async variant runs pipelines concurrently on the worker pool."""
+        import asyncio
+
+        factory = PlayableFactory(cache=ResultCache())
+        factory._analyzer = Mock()
+        factory._analyzer.analyze_screenshots.return_value = make_analysis()
+
+        with patch("src.playable_factory.GameAssetGenerator") as generator_cls:
+            generator = generator_cls.return_value
+            generator.generate_for_game.return_value = GeneratedAssetSet(
+                game_name="Test Game", mechanic_type=MechanicType.TAPPER, style_id="s"
+            )
+            try:
+                results = await asyncio.gather(*(
+                    factory.create_from_screenshots_async([b"shot"], style_id=style)
+                    for style in ("a", "b")
+                ))
+            finally:
+                factory.close()
+
+        assert [r.game_name for r in results] == ["Test Game", "Test Game"]
+        assert generator.generate_for_game.call_count == 2
+
+    async def test_batch_helper_shares_factory_and_keeps_job_order(self):
+        """Test create_playables_async runs every job on one factory, in order."""
+        from src.playable_factory import create_playables_async
+
+        factory = PlayableFactory(cache=ResultCache())
+        factory._analyzer = Mock()
+        factory._analyzer.analyze_screenshots.side_effect = (
+            lambda screenshots, hint: make_analysis(game_name=screenshots[0].decode())
+        )
+        jobs = [
+            {"screenshots": [name.encode()], "style_id": "s", "store_url": "https://store.example/app"}
+            for name in ("A", "B", "C")
+        ]
+
+        with patch("src.playable_factory.GameAssetGenerator") as generator_cls:
+            generator_cls.return_value.generate_for_game.return_value = GeneratedAssetSet(
+                game_name="Test Game", mechanic_type=MechanicType.TAPPER, style_id="s"
+            )
+            try:
+                results = await create_playables_async(jobs, max_concurrency=2, factory=factory)
+            finally:
+                factory.close()
+
+        assert [r.game_name for r in results] == ["A", "B", "C"]
+        assert all("https://store.example/app" in r.html for r in results)
+
+    def test_asset_generator_shared_and_closed(self):
+        """Test one generator serves repeated calls and is closed with the factory."""
+        analysis = make_analysis()
+
+        with patch("src.playable_factory.GameAssetGenerator") as generator_cls:
+            generator = generator_cls.return_value
+            with PlayableFactory(cache=ResultCache()) as factory:
+                for style in ("a", "b"):
+                    factory._generate_assets(analysis, style)
+
+        assert generator_cls.call_count == 1
+        assert generator.generate_for_game.call_count == 2
+        generator.close.assert_called_once()
+        generator.client.close.assert_called_once()
+
+    def test_close_waits_for_running_pipelines(self):
+        """Test close() lets running jobs finish before closing their generators."""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        factory = PlayableFactory(cache=ResultCache())
+        generator = Mock()
+        factory._asset_generators.append(generator)
+        factory._executor = ThreadPoolExecutor(max_workers=1)
+        started = threading.Event()
+
+        def job():
+            started.set()
+            time.sleep(0.05)
+            return generator.close.called
+
+        running = factory._executor.submit(job)
+        queued = factory._executor.submit(job)
+        started.wait()
+        factory.close()
+
+        assert running.result() is False
+        assert queued.cancelled()
+        generator.close.assert_called_once()
+
+    def test_analysis_and_dynamic_generation_share_one_client(self):
+        """Test the factory opens a single Anthropic client for both stages."""
+        factory = PlayableFactory(anthropic_api_key="test-key", cache=ResultCache())
+
+        assert factory._anthropic is None  # Not created until needed
+
+        assert factory._get_analyzer()._analyzer.client is factory._anthropic
+        assert factory._get_dynamic_generator().client is factory._anthropic
+        factory.close()
+
+
+class TestAnalyzerCaching:
+    """Tests for response caching in GameAnalyzer."""
+
+    def _make_analyzer(self, response_text, model="model-a", cache=None):
+        from src.analysis.game_analyzer import GameAnalyzer
+
+        client = Mock()
+        client.messages.create.return_value.content = [Mock(text=response_text)]
+        analyzer = GameAnalyzer(client=client, model=model, cache=cache)
+        analyzer._prepare_image = Mock(return_value=("image/png", "QUJD"))
+        return analyzer
+
+    def test_repeat_analysis_skips_claude(self):
+        """Test a cached response is reused for the same screenshots and model."""
+        analyzer = self._make_analyzer(
+            '```json\n{"game_name": "Cached", "mechanic_type": "TAPPER"}\n```',
+            cache=ResultCache(),
+        )
+
+        first = analyzer.analyze_screenshots([b"shot"], "Hint")
+        second = analyzer.analyze_screenshots([b"shot"], "Hint")
+
+        assert analyzer.client.messages.create.call_count == 1
+        assert second == first
+        assert second.game_name == "Cached"
+
+    def test_cache_hits_do_not_share_mutable_state(self):
+        """Test mutating a returned analysis doesn't leak into later hits."""
+        analyzer = self._make_analyzer(
+            '{"game_name": "Cached", "visual_style": {"color_palette": ["#111111"]}}',
+            cache=ResultCache(),
+        )
+
+        first = analyzer.analyze_screenshots([b"shot"])
+        first.raw_analysis["game_name"] = "Mutated"
+        first.visual_style.color_palette.append("#222222")
+        second = analyzer.analyze_screenshots([b"shot"])
+        second.visual_style.color_palette.clear()
+        third = analyzer.analyze_screenshots([b"shot"])
+
+        assert analyzer.client.messages.create.call_count == 1
+        assert third.raw_analysis["game_name"] == "Cached"
+        assert third.visual_style.color_palette == ["#111111"]
+
+    async def test_async_analysis_uses_async_client_and_cache(self):
+        """Test the async variant calls the async client once and shares the cache."""
+        from unittest.mock import AsyncMock
+
+        analyzer = self._make_analyzer("{}", cache=ResultCache())
+        analyzer._async_client = Mock()
+        analyzer._async_client.messages.create = AsyncMock(
+            return_value=Mock(content=[Mock(text='{"game_name": "Async"}')])
+        )
+
+        first = await analyzer.analyze_screenshots_async([b"a", b"b"])
+        second = analyzer.analyze_screenshots([b"a", b"b"])
+
+        assert first.game_name == second.game_name == "Async"
+        analyzer._async_client.messages.create.assert_awaited_once()
+        analyzer.client.messages.create.assert_not_called()
+        request = analyzer._async_client.messages.create.call_args.kwargs
+        assert len(request["messages"][0]["content"]) == 3  # Two images and the prompt
+
+    async def test_aclose_closes_async_client(self):
+        """Test aclose() closes the async client and allows a fresh one later."""
+        from unittest.mock import AsyncMock
+
+        analyzer = self._make_analyzer("{}")
+        async_client = analyzer._async_client = Mock(close=AsyncMock())
+
+        await analyzer.aclose()
+        await analyzer.aclose()  # Nothing left to close
+
+        async_client.close.assert_awaited_once()
+        assert analyzer._async_client is None
+
+    def test_truncated_response_retried_with_higher_limit(self):
+        """Test a response cut off at max_tokens is requested again, once."""
+        analyzer = self._make_analyzer('{"game_name": "Retried"}')
+        truncated = Mock(content=[Mock(text='{"game_na')], stop_reason="max_tokens")
+        complete = analyzer.client.messages.create.return_value
+        analyzer.client.messages.create.side_effect = [truncated, complete]
+
+        analysis = analyzer.analyze_screenshots([b"shot"])
+
+        limits = [c.kwargs["max_tokens"] for c in analyzer.client.messages.create.call_args_list]
+        assert limits == [analyzer.MAX_TOKENS, analyzer.RETRY_MAX_TOKENS]
+        assert analysis.game_name == "Retried"
+
+    def test_key_includes_model(self):
+        """Test analyses from different models are cached separately."""
+        assert screenshots_key([b"shot"], model="a") != screenshots_key([b"shot"], model="b")
+        assert screenshots_key([b"shot"]) == screenshots_key([b"shot"], model=None)
+
+    def test_analyses_keyed_by_model_and_prompt(self):
+        """Test a changed model or prompt misses analyses cached by another."""
+        from src.analysis.game_analyzer import GameAnalyzer
+
+        cache = ResultCache()
+        analyzers = [
+            self._make_analyzer("{}", model="model-a", cache=cache),
+            self._make_analyzer("{}", model="model-b", cache=cache),
+        ]
+        with patch.object(GameAnalyzer, "ANALYSIS_PROMPT", "Another prompt"):
+            analyzers.append(self._make_analyzer("{}", model="model-a", cache=cache))
+
+        for analyzer in analyzers:
+            analyzer.analyze_screenshots([b"shot"])
+
+        assert [a.client.messages.create.call_count for a in analyzers] == [1, 1, 1]
+
+    def test_fallback_analysis_not_cached(self):
+        """Test unparseable responses are retried rather than cached."""
+        analyzer = self._make_analyzer("not json", cache=ResultCache())
+
+        for _ in range(2):
+            analysis = analyzer.analyze_screenshots([b"shot"])
+
+        assert analyzer.client.messages.create.call_count == 2
+        assert analysis.mechanic_confidence == 0.3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
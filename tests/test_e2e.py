@@ -3,12 +3,14 @@ End-to-End Tests for Playable Ad Generator v2.0
 
 These tests verify the complete pipeline works correctly.
 Demo mode tests run without API keys.
-Full pipeline tests require API keys (skip if not configured).
+Full pipeline tests that need API keys live in test_full_pipeline.py.
 """
 
-import os
+import io
 import sys
 import tempfile
+import zipfile
+from dataclasses import FrozenInstanceError
 from pathlib import Path
 
 import pytest
@@ -16,27 +18,55 @@ import pytest
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.playable_factory import PlayableFactory, PlayableOutput, FactoryConfig
-from src.templates.registry import MechanicType, TEMPLATE_REGISTRY, get_template
-from src.assembly.builder import PlayableBuilder, PlayableConfig, PlayableResult
-from src.generation.game_asset_generator import GeneratedAssetSet
+from src.playable_factory import PlayableFactory, PlayableOutput
+from src.templates.registry import (
+    MechanicType, TEMPLATE_REGISTRY, get_mechanic_examples, get_template,
+    list_available_mechanics,
+)
 from src.generation.sound_generator import SoundGenerator, PROCEDURAL_SOUNDS_JS
+from tests.helpers import PLACEHOLDER_RE, make_analysis, make_assets, make_config
+
+
+DEMO_GAME_NAMES = {
+    MechanicType.MATCH3: "Demo Match-3",
+    MechanicType.RUNNER: "Demo Runner",
+    MechanicType.TAPPER: "Demo Tapper",
+}
+
+
+@pytest.fixture(scope="session")
+def demo_results() -> dict[MechanicType, PlayableOutput]:
+    """One demo playable per mechanic, built once and shared read-only."""
+    with PlayableFactory() as factory:
+        return {
+            mechanic: factory.create_demo(mechanic_type=mechanic, game_name=name)
+            for mechanic, name in DEMO_GAME_NAMES.items()
+        }
+
+
+@pytest.fixture(scope="session", params=list(DEMO_GAME_NAMES), ids=lambda m: m.value)
+def demo_result(request, demo_results) -> PlayableOutput:
+    """Each mechanic's demo playable in turn, from the shared demo_results."""
+    return demo_results[request.param]
+
+
+@pytest.fixture(scope="module")
+def sound_generator() -> SoundGenerator:
+    """Sound generator shared by the sound tests; it holds no state."""
+    return SoundGenerator()
 
 
 # =============================================================================
 # Demo Mode Tests (No API Keys Required)
 # =============================================================================
 
+@pytest.mark.slow
 class TestDemoMode:
     """Tests that run without API keys using fallback graphics."""
 
-    def test_demo_match3(self):
+    def test_demo_match3(self, demo_results):
         """Test demo mode creates valid match-3 playable."""
-        factory = PlayableFactory()
-        result = factory.create_demo(
-            mechanic_type=MechanicType.MATCH3,
-            game_name="Demo Match-3"
-        )
+        result = demo_results[MechanicType.MATCH3]
 
         assert result is not None
         assert result.is_valid, f"Validation errors: {result.validation_errors}"
@@ -47,36 +77,27 @@ class TestDemoMode:
         assert "Match3Scene" in result.html
         assert "openStoreUrl" in result.html
 
-    def test_demo_runner(self):
+    def test_demo_runner(self, demo_results):
         """Test demo mode creates valid runner playable."""
-        factory = PlayableFactory()
-        result = factory.create_demo(
-            mechanic_type=MechanicType.RUNNER,
-            game_name="Demo Runner"
-        )
+        result = demo_results[MechanicType.RUNNER]
 
         assert result is not None
         assert result.is_valid
         assert result.mechanic_type == MechanicType.RUNNER
         assert "RunnerScene" in result.html
 
-    def test_demo_tapper(self):
+    def test_demo_tapper(self, demo_results):
         """Test demo mode creates valid tapper playable."""
-        factory = PlayableFactory()
-        result = factory.create_demo(
-            mechanic_type=MechanicType.TAPPER,
-            game_name="Demo Tapper"
-        )
+        result = demo_results[MechanicType.TAPPER]
 
         assert result is not None
         assert result.is_valid
         assert result.mechanic_type == MechanicType.TAPPER
         assert "TapperScene" in result.html
 
-    def test_demo_save_html(self):
+    def test_demo_save_html(self, demo_results):
         """Test saving demo playable as HTML file."""
-        factory = PlayableFactory()
-        result = factory.create_demo(mechanic_type=MechanicType.MATCH3)
+        result = demo_results[MechanicType.MATCH3]
 
         with tempfile.TemporaryDirectory() as tmpdir:
             html_path = Path(tmpdir) / "test.html"
@@ -87,22 +108,18 @@ class TestDemoMode:
             assert "<!DOCTYPE html>" in content
             assert "Phaser" in content
 
-    def test_demo_save_zip(self):
+    def test_demo_save_zip(self, demo_results):
         """Test saving demo playable as ZIP file."""
-        factory = PlayableFactory()
-        result = factory.create_demo(mechanic_type=MechanicType.RUNNER)
+        result = demo_results[MechanicType.RUNNER]
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            zip_path = Path(tmpdir) / "test.zip"
-            result.save_zip(zip_path)
+        buffer = io.BytesIO()
+        result.save_zip(buffer)
 
-            assert zip_path.exists()
-            assert zip_path.stat().st_size > 0
+        assert buffer.tell() > 0
 
-            # Verify ZIP contents
-            import zipfile
-            with zipfile.ZipFile(zip_path, 'r') as zf:
-                assert "index.html" in zf.namelist()
+        # Verify ZIP contents
+        with zipfile.ZipFile(buffer, 'r') as zf:
+            assert "index.html" in zf.namelist()
 
 
 # =============================================================================
@@ -135,6 +152,37 @@ class TestTemplateRegistry:
             path = template.get_template_path()
             assert path.exists(), f"Template file missing: {path}"
 
+    def test_template_path_precomputed(self):
+        """Verify each template's path is computed once, not per call."""
+        for template in TEMPLATE_REGISTRY.values():
+            assert template.get_template_path() is template.get_template_path()
+
+    def test_precomputed_asset_keys_and_examples(self):
+        """Verify precomputed lookups match the template definitions."""
+        tapper = TEMPLATE_REGISTRY[MechanicType.TAPPER]
+        assert tapper.get_asset_keys() == ["target", "background"]  # bonus is optional
+        assert get_mechanic_examples()[MechanicType.TAPPER] == list(tapper.example_games)
+
+    def test_registry_lookups_return_caller_owned_copies(self):
+        """Verify mutating returned lists doesn't change later lookups."""
+        tapper = TEMPLATE_REGISTRY[MechanicType.TAPPER]
+        tapper.get_asset_keys().append("extra")
+        get_mechanic_examples()[MechanicType.TAPPER].clear()
+        list_available_mechanics().clear()
+
+        assert tapper.get_asset_keys() == ["target", "background"]
+        assert get_mechanic_examples()[MechanicType.TAPPER] == list(tapper.example_games)
+        assert list_available_mechanics() == list(TEMPLATE_REGISTRY)
+
+    def test_registry_entries_are_immutable(self):
+        """Verify registry entries can't be modified through shared instances."""
+        template = TEMPLATE_REGISTRY[MechanicType.TAPPER]
+        with pytest.raises(FrozenInstanceError):
+            template.template_file = "other.html"
+        with pytest.raises(FrozenInstanceError):
+            template.required_assets[0].max_size = 1024
+        assert len({hash(t) for t in TEMPLATE_REGISTRY.values()}) == len(TEMPLATE_REGISTRY)
+
     def test_template_has_phaser_config(self):
         """Verify templates contain Phaser configuration."""
         for mechanic, template in TEMPLATE_REGISTRY.items():
@@ -145,6 +193,14 @@ class TestTemplateRegistry:
             assert "Phaser.Game" in content, f"{mechanic.value} missing Phaser.Game"
             assert "${PHASER_SCRIPT}" in content, f"{mechanic.value} missing PHASER_SCRIPT placeholder"
 
+    def test_mechanic_from_string(self):
+        """Verify exact, partial and priority-ordered mechanic matching."""
+        assert MechanicType.from_string(" Runner ") == MechanicType.RUNNER
+        assert MechanicType.from_string("match-3 puzzle") == MechanicType.MATCH3
+        assert MechanicType.from_string("idle runner") == MechanicType.RUNNER
+        assert MechanicType.from_string("block shooter") == MechanicType.PUZZLE
+        assert MechanicType.from_string("racing") == MechanicType.UNKNOWN
+
 
 # =============================================================================
 # Builder Tests
@@ -153,99 +209,34 @@ class TestTemplateRegistry:
 class TestPlayableBuilder:
     """Tests for playable assembly."""
 
-    def test_build_with_empty_assets(self):
-        """Test building with empty asset set (uses fallbacks)."""
-        from src.analysis.game_analyzer import GameAnalysis, VisualStyle
-
-        analysis = GameAnalysis(
-            game_name="Test Game",
-            publisher="Test",
-            mechanic_type=MechanicType.MATCH3,
-            mechanic_confidence=1.0,
-            mechanic_reasoning="Test",
-            visual_style=VisualStyle(
-                art_type="cartoon",
-                color_palette=["#FF0000", "#00FF00"],
-                theme="casual",
-                mood="playful",
-            ),
-            assets_needed=[],
-            recommended_template="match3",
-            template_config={},
-            core_loop_description="Test game",
-            hook_suggestion="Play Now!",
-            cta_suggestion="Download!",
-        )
-
-        assets = GeneratedAssetSet(
-            game_name="Test Game",
-            mechanic_type=MechanicType.MATCH3,
-            style_id="test",
-        )
-
-        config = PlayableConfig(
-            game_name="Test Game",
-            store_url="https://example.com",
+    @pytest.mark.parametrize("mechanic, config_overrides", [
+        (MechanicType.MATCH3, {}),
+        (MechanicType.TAPPER, {
+            "title": "My Title",
+            "store_url": "https://test.example.com",
+            "hook_text": "Custom Hook",
+            "cta_text": "Custom CTA",
+            "background_color": "#123456",
+        }),
+    ], ids=["match3-defaults", "tapper-custom-config"])
+    def test_build_substitutes_config(self, builder, mechanic, config_overrides):
+        """Test building with empty assets (fallbacks) substitutes every config value."""
+        name = f"{mechanic.value} Test"
+        analysis = make_analysis(
+            game_name=name, mechanic_type=mechanic, recommended_template=mechanic.value
         )
+        assets = make_assets(game_name=name, mechanic_type=mechanic)
 
-        builder = PlayableBuilder()
-        result = builder.build(analysis, assets, config)
+        result = builder.build(analysis, assets, make_config(game_name=name, **config_overrides))
 
-        assert result is not None
         assert result.file_size_bytes > 0
         assert "openStoreUrl" in result.html
-
-    def test_config_substitution(self):
-        """Test that config values are properly substituted."""
-        from src.analysis.game_analyzer import GameAnalysis, VisualStyle
-
-        analysis = GameAnalysis(
-            game_name="Substitution Test",
-            publisher="Test",
-            mechanic_type=MechanicType.TAPPER,
-            mechanic_confidence=1.0,
-            mechanic_reasoning="Test",
-            visual_style=VisualStyle(
-                art_type="cartoon",
-                color_palette=["#FF0000"],
-                theme="casual",
-                mood="playful",
-            ),
-            assets_needed=[],
-            recommended_template="tapper",
-            template_config={},
-            core_loop_description="Test",
-            hook_suggestion="Test Hook!",
-            cta_suggestion="Test CTA!",
-        )
-
-        assets = GeneratedAssetSet(
-            game_name="Substitution Test",
-            mechanic_type=MechanicType.TAPPER,
-            style_id="test",
-        )
-
-        config = PlayableConfig(
-            game_name="Substitution Test",
-            title="My Title",
-            store_url="https://test.example.com",
-            hook_text="Custom Hook",
-            cta_text="Custom CTA",
-            background_color="#123456",
-        )
-
-        builder = PlayableBuilder()
-        result = builder.build(analysis, assets, config)
-
-        # Check substitutions
-        assert "My Title" in result.html
-        assert "https://test.example.com" in result.html
-        assert "Custom Hook" in result.html
-        assert "Custom CTA" in result.html
-        assert "#123456" in result.html
+        missing = [v for v in config_overrides.values() if v not in result.html]
+        assert not missing, f"Not substituted: {missing}"
 
         # Verify no unsubstituted placeholders remain
-        assert "${" not in result.html, "Unsubstituted placeholders found"
+        match = PLACEHOLDER_RE.search(result.html)
+        assert match is None, f"Unsubstituted placeholder: {match.group()}"
 
 
 # =============================================================================
@@ -261,62 +252,28 @@ class TestSoundGenerator:
         assert len(PROCEDURAL_SOUNDS_JS) > 100
         assert "SoundFX" in PROCEDURAL_SOUNDS_JS
 
-    def test_sound_integration_for_mechanics(self):
+    @pytest.mark.parametrize("mechanic", ["match3", "runner", "tapper"])
+    def test_sound_integration_for_mechanics(self, sound_generator, mechanic):
         """Verify sound integrations exist for all mechanics."""
-        generator = SoundGenerator()
+        integration = sound_generator.get_sound_integration_for_mechanic(mechanic)
 
-        mechanics = ["match3", "runner", "tapper"]
-        for mechanic in mechanics:
-            integration = generator.get_sound_integration_for_mechanic(mechanic)
-            assert integration is not None
-            assert len(integration) > 0
+        assert integration
 
 
 # =============================================================================
 # Network Compatibility Tests
 # =============================================================================
 
+@pytest.mark.slow
 class TestNetworkCompatibility:
     """Tests for ad network size limits."""
 
-    def test_demo_under_5mb(self):
-        """Verify demo playables are under 5MB limit."""
-        factory = PlayableFactory()
-
-        for mechanic in [MechanicType.MATCH3, MechanicType.RUNNER, MechanicType.TAPPER]:
-            result = factory.create_demo(mechanic_type=mechanic)
-            assert result.file_size_mb < 5.0, f"{mechanic.value} exceeds 5MB: {result.file_size_formatted}"
-
-    def test_demo_under_2mb_for_facebook(self):
-        """Verify demo playables could work with Facebook's 2MB limit."""
-        factory = PlayableFactory()
-
-        for mechanic in [MechanicType.MATCH3, MechanicType.RUNNER, MechanicType.TAPPER]:
-            result = factory.create_demo(mechanic_type=mechanic)
-            # Demo mode uses fallback graphics, should be well under 2MB
-            assert result.file_size_mb < 2.0, f"{mechanic.value} exceeds 2MB: {result.file_size_formatted}"
-
-
-# =============================================================================
-# Full Pipeline Tests (Requires API Keys)
-# =============================================================================
-
-@pytest.mark.skipif(
-    not os.getenv("ANTHROPIC_API_KEY") or not os.getenv("LAYER_API_KEY"),
-    reason="API keys not configured"
-)
-class TestFullPipeline:
-    """Tests that require API keys."""
-
-    def test_game_analysis(self):
-        """Test Claude Vision game analysis with real screenshot."""
-        # This would require a real screenshot
-        pytest.skip("Requires sample screenshot")
-
-    def test_asset_generation(self):
-        """Test Layer.ai asset generation."""
-        # This would require Layer.ai credits
-        pytest.skip("Requires Layer.ai credits")
+    def test_demo_within_size_limits(self, demo_result):
+        """Verify demo playables fit Facebook's 2MB limit (and so the usual 5MB)."""
+        # Demo mode uses fallback graphics, should be well under 2MB
+        assert demo_result.file_size_mb < 2.0, (
+            f"{demo_result.mechanic_type.value} exceeds 2MB: {demo_result.file_size_formatted}"
+        )
 
 
 # =============================================================================
@@ -0,0 +1,26 @@
+"""
+Full pipeline tests against the live Claude and Layer.ai APIs.
+
+Skipped as a whole, at import, unless both API keys are configured.
+"""
+
+import os
+
+import pytest
+
+if not (os.getenv("ANTHROPIC_API_KEY") and os.getenv("LAYER_API_KEY")):
+    pytest.skip("API keys not configured", allow_module_level=True)
+
+
+class TestFullPipeline:
+    """Tests that require API keys."""
+
+    def test_game_analysis(self):
+        """Test Claude Vision game analysis with real screenshot."""
+        # This would require a real screenshot
+        pytest.skip("Requires sample screenshot")
+
+    def test_asset_generation(self):
+        """Test Layer.ai asset generation."""
+        # This would require Layer.ai credits
+        pytest.skip("Requires Layer.ai credits")
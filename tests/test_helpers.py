@@ -0,0 +1,84 @@
+"""
+Tests for shared utilities (src.utils.helpers).
+"""
+
+import pytest
+
+from src.utils.helpers import Settings, format_file_size, get_settings, validate_api_keys
+
+
+class TestSettings:
+    """Tests for environment-backed settings."""
+
+    def test_defaults_without_environment(self):
+        """Test unset variables fall back to field defaults."""
+        settings = Settings.from_env({})
+
+        assert settings.layer_api_url == "https://api.app.layer.ai/graphql"
+        assert settings.supabase_url is None
+        assert settings.api_fetch_timeout == 15
+
+    def test_values_are_converted_by_type(self):
+        """Test env strings are parsed to the field types, case-insensitively."""
+        settings = Settings.from_env({
+            "DEBUG": "yes",
+            "API_FETCH_TIMEOUT": "20",
+            "max_playable_size_mb": "2.5",
+            "LAYER_API_KEY": "key",
+        })
+
+        assert settings.debug is True
+        assert settings.api_fetch_timeout == 20
+        assert settings.max_playable_size_mb == 2.5
+        assert settings.layer_api_key == "key"
+
+    def test_invalid_value_raises(self):
+        """Test unparseable values name the offending variable."""
+        with pytest.raises(ValueError, match="API_FETCH_TIMEOUT"):
+            Settings.from_env({"API_FETCH_TIMEOUT": "soon"})
+
+    def test_secrets_hidden_from_repr(self):
+        """Test API keys don't leak into logs via repr."""
+        assert "secret" not in repr(Settings.from_env({"ANTHROPIC_API_KEY": "secret"}))
+
+
+class TestValidateApiKeys:
+    """Tests for the API key status check."""
+
+    def test_status_is_cached_and_read_only(self, monkeypatch):
+        """Test one shared, immutable result reflects the loaded settings."""
+        monkeypatch.setenv("LAYER_API_KEY", "key")
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        get_settings.cache_clear()
+        validate_api_keys.cache_clear()
+        try:
+            status = validate_api_keys()
+
+            assert status["layer_api_key"] is True
+            assert status["anthropic_api_key"] is False
+            assert validate_api_keys() is status
+            with pytest.raises(TypeError):
+                status["anthropic_api_key"] = True
+        finally:
+            get_settings.cache_clear()
+            validate_api_keys.cache_clear()
+
+
+class TestFormatFileSize:
+    """Tests for human-readable sizes."""
+
+    @pytest.mark.parametrize("size,expected", [
+        (0, "0.00 B"),
+        (1023, "1023.00 B"),
+        (1024, "1.00 KB"),
+        (5 * 1024 * 1024, "5.00 MB"),
+        (3 * 1024 ** 4, "3.00 TB"),
+        (2 * 1024 ** 5, "2048.00 TB"),
+    ])
+    def test_units(self, size, expected):
+        """Test unit selection at and around the boundaries."""
+        assert format_file_size(size) == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -5,8 +5,8 @@ Basic test coverage for core functionality.
 """
 
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, AsyncMock
-from dataclasses import asdict
 
 from src.layer_client import (
     LayerClient,
@@ -18,6 +18,16 @@ from src.layer_client import (
     GenerationStatus,
     LayerAPIError,
     InsufficientCreditsError,
+    GenerationTimeoutError,
+)
+
+# Plain settings stub; tests only read these values
+_SETTINGS = SimpleNamespace(
+    layer_api_url="https://api.test.com/graphql",
+    layer_api_key="test-key",
+    layer_workspace_id="test-workspace",
+    min_credits_required=50,
+    forge_poll_timeout=60,
 )
 
 
@@ -29,20 +39,6 @@ from src.layer_client import (
 class TestStyleConfig:
     """Tests for StyleConfig dataclass."""
 
-    def test_create_style_config(self):
-        """Test creating a StyleConfig."""
-        config = StyleConfig(
-            name="Test Style",
-            description="Test description",
-            style_keywords=["cartoon", "vibrant"],
-            negative_keywords=["dark", "realistic"],
-        )
-
-        assert config.name == "Test Style"
-        assert config.description == "Test description"
-        assert "cartoon" in config.style_keywords
-        assert "dark" in config.negative_keywords
-
     def test_to_prompt_prefix(self):
         """Test prompt prefix generation."""
         config = StyleConfig(
@@ -82,22 +78,6 @@ class TestStyleConfig:
 class TestStyleRecipe:
     """Tests for StyleRecipe dataclass."""
 
-    def test_create_style_recipe(self):
-        """Test creating a StyleRecipe."""
-        recipe = StyleRecipe(
-            style_name="Casual Match-3",
-            prefix=["cartoon", "2D"],
-            technical=["cel-shaded", "clean lines"],
-            negative=["realistic", "dark"],
-            palette_primary="#FF6B6B",
-            palette_accent="#4ECDC4",
-        )
-
-        assert recipe.style_name == "Casual Match-3"
-        assert "cartoon" in recipe.prefix
-        assert "cel-shaded" in recipe.technical
-        assert recipe.palette_primary == "#FF6B6B"
-
     def test_to_style_config(self):
         """Test converting StyleRecipe to StyleConfig."""
         recipe = StyleRecipe(
@@ -115,8 +95,8 @@ class TestStyleRecipe:
         assert "cel-shaded" in config.style_keywords
         assert "dark" in config.negative_keywords
 
-    def test_to_dict(self):
-        """Test converting StyleRecipe to dictionary."""
+    def test_dict_round_trip(self):
+        """Test to_dict emits the PRD schema and from_dict reads it back."""
         recipe = StyleRecipe(
             style_name="Test",
             prefix=["a", "b"],
@@ -124,35 +104,20 @@ class TestStyleRecipe:
             negative=["d"],
             palette_primary="#FF0000",
             palette_accent="#00FF00",
+            reference_image_id="img-1",
         )
 
         d = recipe.to_dict()
 
-        assert d["styleName"] == "Test"
-        assert d["prefix"] == ["a", "b"]
-        assert d["technical"] == ["c"]
-        assert d["negative"] == ["d"]
-        assert d["palette"]["primary"] == "#FF0000"
-        assert d["palette"]["accent"] == "#00FF00"
-
-    def test_from_dict(self):
-        """Test creating StyleRecipe from dictionary."""
-        data = {
-            "styleName": "From Dict",
-            "prefix": ["x", "y"],
-            "technical": ["z"],
-            "negative": ["n"],
-            "palette": {
-                "primary": "#111111",
-                "accent": "#222222",
-            },
+        assert d == {
+            "styleName": "Test",
+            "prefix": ["a", "b"],
+            "technical": ["c"],
+            "negative": ["d"],
+            "palette": {"primary": "#FF0000", "accent": "#00FF00"},
+            "referenceImageId": "img-1",
         }
-
-        recipe = StyleRecipe.from_dict(data)
-
-        assert recipe.style_name == "From Dict"
-        assert recipe.prefix == ["x", "y"]
-        assert recipe.palette_primary == "#111111"
+        assert StyleRecipe.from_dict(d) == recipe
 
 
 # =============================================================================
@@ -163,29 +128,30 @@ class TestStyleRecipe:
 class TestWorkspaceInfo:
     """Tests for WorkspaceInfo dataclass."""
 
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def mock_settings(cls):
+        """Mock settings once for the whole class."""
+        with patch("src.layer_client.get_settings", return_value=_SETTINGS) as mock:
+            yield mock
+
     def test_has_credits_sufficient(self):
         """Test has_credits when credits are sufficient."""
-        with patch("src.layer_client.get_settings") as mock_settings:
-            mock_settings.return_value.min_credits_required = 50
-
-            info = WorkspaceInfo(
-                workspace_id="test",
-                credits_available=100,
-            )
+        info = WorkspaceInfo(
+            workspace_id="test",
+            credits_available=100,
+        )
 
-            assert info.has_credits is True
+        assert info.has_credits is True
 
     def test_has_credits_insufficient(self):
         """Test has_credits when credits are insufficient."""
-        with patch("src.layer_client.get_settings") as mock_settings:
-            mock_settings.return_value.min_credits_required = 50
-
-            info = WorkspaceInfo(
-                workspace_id="test",
-                credits_available=30,
-            )
+        info = WorkspaceInfo(
+            workspace_id="test",
+            credits_available=30,
+        )
 
-            assert info.has_credits is False
+        assert info.has_credits is False
 
 
 # =============================================================================
@@ -196,25 +162,10 @@ class TestWorkspaceInfo:
 class TestGeneratedImage:
     """Tests for GeneratedImage dataclass."""
 
-    def test_create_generated_image(self):
-        """Test creating a GeneratedImage."""
-        image = GeneratedImage(
-            task_id="task-123",
-            status=GenerationStatus.COMPLETED,
-            image_url="https://example.com/image.png",
-            image_id="img-456",
-        )
-
-        assert image.task_id == "task-123"
-        assert image.status == GenerationStatus.COMPLETED
-        assert image.image_url == "https://example.com/image.png"
-
-    def test_generation_status_values(self):
-        """Test GenerationStatus enum values."""
-        assert GenerationStatus.PENDING == "PENDING"
-        assert GenerationStatus.PROCESSING == "PROCESSING"
-        assert GenerationStatus.COMPLETED == "COMPLETED"
-        assert GenerationStatus.FAILED == "FAILED"
+    @pytest.mark.parametrize("value", ["PENDING", "PROCESSING", "COMPLETED", "FAILED"])
+    def test_generation_status_values(self, value):
+        """Test GenerationStatus members compare equal to their API strings."""
+        assert GenerationStatus[value] == value
 
 
 # =============================================================================
@@ -225,26 +176,26 @@ class TestGeneratedImage:
 class TestLayerClient:
     """Tests for LayerClient class."""
 
-    @pytest.fixture
-    def mock_settings(self):
-        """Mock settings for tests."""
-        with patch("src.layer_client.get_settings") as mock:
-            mock.return_value.layer_api_url = "https://api.test.com/graphql"
-            mock.return_value.layer_api_key = "test-key"
-            mock.return_value.layer_workspace_id = "test-workspace"
-            mock.return_value.min_credits_required = 50
-            mock.return_value.forge_poll_timeout = 60
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def mock_settings(cls):
+        """Mock settings once for the whole class."""
+        with patch("src.layer_client.get_settings", return_value=_SETTINGS) as mock:
             yield mock
 
-    def test_client_initialization(self, mock_settings):
-        """Test LayerClient initialization."""
-        client = LayerClient()
+    @pytest.fixture(scope="class")
+    @classmethod
+    def default_client(cls, mock_settings):
+        """Client built from the mocked settings; for read-only checks."""
+        return LayerClient()
 
-        assert client.api_url == "https://api.test.com/graphql"
-        assert client.api_key == "test-key"
-        assert client.workspace_id == "test-workspace"
+    def test_client_initialization(self, default_client):
+        """Test LayerClient initialization."""
+        assert default_client.api_url == "https://api.test.com/graphql"
+        assert default_client.api_key == "test-key"
+        assert default_client.workspace_id == "test-workspace"
 
-    def test_client_custom_params(self, mock_settings):
+    def test_client_custom_params(self):
         """Test LayerClient with custom parameters."""
         client = LayerClient(
             api_url="https://custom.api.com",
@@ -256,6 +207,93 @@ class TestLayerClient:
         assert client.api_key == "custom-key"
         assert client.workspace_id == "custom-workspace"
 
+    async def test_poll_generation_adaptive_wait(self):
+        """Test polling jumps ahead to the expected duration, then backs off."""
+        client = LayerClient()
+        pending = GeneratedImage(task_id="t", status=GenerationStatus.PROCESSING)
+        done = GeneratedImage(
+            task_id="t",
+            status=GenerationStatus.COMPLETED,
+            image_url="https://example.com/image.png",
+        )
+        client.get_generation_status = AsyncMock(side_effect=[pending, pending, done])
+
+        client._generation_duration_ewma = 10.0
+
+        with patch("src.layer_client.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            result = await client.poll_generation("t", poll_interval=2.0)
+
+        waits = [call.args[0] for call in sleep.await_args_list]
+        assert waits[0] == pytest.approx(8.0, abs=0.1)
+        assert waits[1] == 2.0
+        assert client._generation_duration_ewma < 10.0
+        assert LayerClient()._generation_duration_ewma == LayerClient.INITIAL_GENERATION_ESTIMATE
+        assert result.status == GenerationStatus.COMPLETED
+
+    async def test_poll_generation_waits_capped_by_timeout(self):
+        """Test no wait sleeps past the timeout, even when the estimate is longer."""
+        client = LayerClient()
+        client._generation_duration_ewma = 30.0
+        clock = [0.0]
+
+        async def status(task_id):
+            clock[0] += 0.1  # Each status request takes a little time
+            return GeneratedImage(task_id=task_id, status=GenerationStatus.PROCESSING)
+
+        async def sleep(seconds):
+            clock[0] += seconds
+
+        client.get_generation_status = status
+        with patch("src.layer_client.time.monotonic", side_effect=lambda: clock[0]), \
+                patch("src.layer_client.asyncio.sleep", side_effect=sleep), \
+                pytest.raises(GenerationTimeoutError):
+            await client.poll_generation("t", timeout_seconds=3, poll_interval=2.0)
+
+        assert clock[0] < 3.5
+
+    async def test_download_image(self):
+        """Test image download returns the response body."""
+        import httpx
+
+        body = b"\x89PNG" + b"\x00" * 200_000
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+        client = LayerClient()
+        client._client = httpx.AsyncClient(transport=transport)
+
+        try:
+            data = await client.download_image("https://cdn.example.com/a.png")
+        finally:
+            await client._client.aclose()
+
+        assert data == body
+
+    def test_generate_many_with_polling(self):
+        """Test batch generation keeps prompt order and isolates failures."""
+        async def generate(prompt, style_id):
+            if prompt == "bad":
+                raise LayerAPIError("Generation failed")
+            return GeneratedImage(
+                task_id=prompt,
+                status=GenerationStatus.COMPLETED,
+                image_url=f"https://example.com/{prompt}.png",
+            )
+
+        sync_client = LayerClientSync()
+        sync_client._client = Mock(generate_with_polling=AsyncMock(side_effect=generate))
+        completed = []
+
+        try:
+            results = sync_client.generate_many_with_polling(
+                ["a", "bad", "c"], "style", on_complete=completed.append
+            )
+        finally:
+            sync_client._client = None
+            sync_client.close()
+
+        assert [r.task_id for r in (results[0], results[2])] == ["a", "c"]
+        assert isinstance(results[1], LayerAPIError)
+        assert sorted(completed) == [0, 1, 2]
+
 
 # =============================================================================
 # Exception Tests